@@ -0,0 +1,312 @@
+"""
+This module benchmarks the word decoder and the phoneme confusability analysis. Every workload is either real data from
+the repository or synthetic data made from a seeded random generator, so two runs with the same seed time exactly the
+same work.
+
+The benchmarks are:
+- decode_words in every greedy mode over the whole Jolly Phonics and Letters and Sounds vocabularies
+- decode_words in every greedy mode over synthetic words made of the most ambiguous graphemes, for growing word lengths
+- normalised_dataframe and corr_files over the five feature datasets
+- normalised_dataframe and corr_files over synthetic feature datasets, for growing numbers of phonemes
+
+The scaled benchmarks stop growing once a size takes longer than the time budget, so a complexity blow-up shows as a
+steep rise in the last sizes rather than a run that never ends. The results are saved as JSON, and two results files,
+e.g., from two commits, can be compared with --compare.
+
+Run it from anywhere with: python benchmarks/benchmark.py [--seed SEED] [--repeats N] [--output FILE]
+"""
+import argparse
+import glob
+import importlib.util
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from types import ModuleType
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORD_DECODER = os.path.join(ROOT, "word_decoder")
+PHONEME_CONFUSABILITY = os.path.join(ROOT, "phoneme_confusability")
+sys.path.insert(0, WORD_DECODER)
+
+import curricula_analysis  # noqa: E402
+import decoder  # noqa: E402
+
+PHONEME_FILE = os.path.join(WORD_DECODER, "phoneme dictionary.xlsx - Sheet1.csv")
+VOCABULARIES = {"JP": (os.path.join(WORD_DECODER, "Jolly Phonics Curriculum Coding Sheet - Coder 1.csv"), decoder.JP),
+                "LS": (os.path.join(WORD_DECODER, "Letters and Sounds Curriculum Coding Sheet - Coder 1.csv"),
+                       decoder.LS)}
+GREEDY_MODES = ['no', 'small', 'big']
+AMBIGUOUS_GRAPHEMES = 8  # the synthetic words are made of this many graphemes with the most phonemes
+SYNTHETIC_WORDS = 20  # number of synthetic words of each length
+WORD_LENGTHS = range(1, 13)  # numbers of graphemes of the synthetic words; every mode grows exponentially with it
+INVENTORY_SIZES = [50, 100, 200, 400, 800]  # numbers of phonemes of the synthetic feature datasets
+SYNTHETIC_FEATURES = 25  # number of features of the synthetic feature datasets
+TIME_BUDGET = 5.0  # seconds a size of a scaled benchmark may take before larger sizes are skipped
+OUTPUT = os.path.join(ROOT, "benchmarks", "results")
+
+
+def time_call(function: Callable[[], object], repeats: int) -> float:
+    """
+    This function times a call.
+    :param function: the call to time
+    :param repeats: the number of times to make the call
+    :return: the shortest time of the calls in seconds
+    """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def record(name: str, size: int, seconds: float, repeats: int) -> dict:
+    """
+    This function returns the result of one benchmark.
+    :param name: the name of the benchmark
+    :param size: the size of the input, e.g., the number of words or phonemes
+    :param seconds: the shortest time of the calls in seconds
+    :param repeats: the number of calls that were timed
+    :return: a dictionary with the result
+    """
+    return {"name": name, "size": size, "seconds": seconds, "repeats": repeats}
+
+
+def synthetic_words(phoneme_dict: dict[str, list[str]], length: int, count: int, rng: random.Random) -> list[str]:
+    """
+    This function makes words out of the graphemes with the most phonemes, which have the most transcriptions.
+    :param phoneme_dict: a dictionary containing grapheme-phoneme correspondences
+    :param length: the number of graphemes in each word
+    :param count: the number of words
+    :param rng: the random generator to draw the graphemes with
+    :return: a list of words
+    """
+    graphemes = sorted(phoneme_dict, key=lambda grapheme: (-len(phoneme_dict[grapheme]), grapheme))
+    graphemes = graphemes[:AMBIGUOUS_GRAPHEMES]
+    return ["".join(rng.choice(graphemes) for _ in range(length)) for _ in range(count)]
+
+
+def synthetic_dataset(directory: str, name: str, phonemes: int, rng: np.random.Generator) -> str:
+    """
+    This function writes a feature dataset with random feature values of -1, 0 or 1 in the format that
+    confusion_matrix.py reads.
+    :param directory: the directory to write the dataset in
+    :param name: the name of the .txt file of the dataset
+    :param phonemes: the number of phonemes of the dataset
+    :param rng: the random generator to draw the values with
+    :return: the name of the .txt file of the dataset
+    """
+    values = rng.integers(-1, 2, size=(SYNTHETIC_FEATURES, phonemes))
+    with open(os.path.join(directory, name), "w") as f:
+        f.write("Features, " + ", ".join("p" + str(i) for i in range(phonemes)))
+        for j, row in enumerate(values):
+            f.write("\nf" + str(j) + ", " + ", ".join(str(value) for value in row))
+    return name
+
+
+def bench_vocabularies(repeats: int) -> list[dict]:
+    """
+    This function times decode_words in every greedy mode over the whole vocabulary of each curriculum.
+    :param repeats: the number of times to time each call
+    :return: a list of results
+    """
+    results = []
+    for curriculum, (file, column) in VOCABULARIES.items():
+        words = curricula_analysis.get_curricula_vocabulary(file, 3)["Orthography"].tolist()
+        phoneme_dict = decoder.curricula_gpcs(PHONEME_FILE, column, False)
+        for greedy in GREEDY_MODES:
+            seconds = time_call(lambda: decoder.decode_words(words, phoneme_dict, greedy), repeats)
+            results.append(record("decode_words/" + curriculum + "/" + greedy, len(words), seconds, repeats))
+    return results
+
+
+def bench_synthetic_words(seed: int, repeats: int, budget: float) -> list[dict]:
+    """
+    This function times decode_words in every greedy mode over synthetic words of growing lengths.
+    :param seed: the seed of the random generator
+    :param repeats: the number of times to time each call
+    :param budget: the time in seconds a length may take before longer words are skipped
+    :return: a list of results, where the size is the number of graphemes in each word
+    """
+    results = []
+    phoneme_dict = decoder.read_orthography(PHONEME_FILE)
+    for greedy in GREEDY_MODES:
+        rng = random.Random(seed)
+        for length in WORD_LENGTHS:
+            words = synthetic_words(phoneme_dict, length, SYNTHETIC_WORDS, rng)
+            seconds = time_call(lambda: decoder.decode_words(words, phoneme_dict, greedy), repeats)
+            results.append(record("decode_words/synthetic/" + greedy, length, seconds, repeats))
+            if seconds > budget:
+                break
+    return results
+
+
+def load_confusion_matrix(directory: str) -> tuple[ModuleType, list[str]]:
+    """
+    This function copies confusion_matrix.py and the feature datasets of phoneme_confusability to a directory and
+    imports the copy of the module. Every version of the module writes its results next to itself, so the results of
+    the copy are written to <directory> and the Results directory of the repository is left as it is.
+    :param directory: the directory to copy the module and the datasets to
+    :return: a tuple containing the copy of the module and the .txt files of the datasets
+    """
+    files = sorted(os.path.basename(fil) for fil in glob.glob(os.path.join(PHONEME_CONFUSABILITY, "*.txt")))
+    for fil in files + ["confusion_matrix.py"]:
+        shutil.copy(os.path.join(PHONEME_CONFUSABILITY, fil), directory)
+    spec = importlib.util.spec_from_file_location("confusion_matrix", os.path.join(directory, "confusion_matrix.py"))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["confusion_matrix"] = module  # so the worker processes of the module can find its functions
+    spec.loader.exec_module(module)
+    return module, files
+
+
+def clear_feature_tables(module: ModuleType) -> None:
+    """
+    This function empties the cache of parsed feature tables of confusion_matrix.py, if it has one, so that every timed
+    call parses the datasets again. Older versions of the module have no cache, and then nothing is done.
+    :param module: confusion_matrix.py as returned by <load_confusion_matrix>
+    :return: None
+    """
+    tables = getattr(module, "_feature_tables", None)
+    if tables is not None:
+        tables.clear()
+
+
+def bench_feature_files(module: ModuleType, files: list[str], repeats: int, size: int) -> list[dict]:
+    """
+    This function times normalised_dataframe and corr_files for both methods over datasets in the working directory.
+    The feature tables are parsed again for every call.
+    :param module: confusion_matrix.py as returned by <load_confusion_matrix>
+    :param files: the .txt files of the datasets
+    :param repeats: the number of times to time each call
+    :param size: the size to record the results with
+    :return: a list of results
+    """
+    results = []
+    for overlap in [True, False]:
+        method = "overlap" if overlap else "correlation"
+
+        def normalise() -> None:
+            clear_feature_tables(module)
+            module.normalised_dataframe(files, overlap)
+
+        def correlate() -> None:
+            clear_feature_tables(module)
+            module.corr_files(files, overlap)
+
+        results.append(record("normalised_dataframe/" + method, size, time_call(normalise, repeats), repeats))
+        results.append(record("corr_files/" + method, size, time_call(correlate, repeats), repeats))
+    return results
+
+
+def bench_datasets(seed: int, repeats: int, budget: float) -> list[dict]:
+    """
+    This function times the confusability analysis over the five feature datasets, and over pairs of synthetic datasets
+    with growing numbers of phonemes. The analysis is run by a copy of confusion_matrix.py in a temporary directory, as
+    described in <load_confusion_matrix>, so its results are not written to the Results directory.
+    :param seed: the seed of the random generator
+    :param repeats: the number of times to time each call
+    :param budget: the time in seconds a size may take before larger sizes are skipped
+    :return: a list of results, where the size is the number of datasets for the real datasets and the number of
+    phonemes for the synthetic ones
+    """
+    results = []
+    working_directory = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        module, files = load_confusion_matrix(directory)
+        try:
+            os.chdir(directory)
+            results.extend(record("datasets/" + result["name"], len(files), result["seconds"], repeats)
+                           for result in bench_feature_files(module, files, repeats, len(files)))
+
+            rng = np.random.default_rng(seed)
+            for phonemes in INVENTORY_SIZES:
+                files = [synthetic_dataset(directory, "synthetic" + str(phonemes) + suffix + ".txt", phonemes, rng)
+                         for suffix in ["a", "b"]]
+                scaled = bench_feature_files(module, files, repeats, phonemes)
+                results.extend(record("synthetic/" + result["name"], phonemes, result["seconds"], repeats)
+                               for result in scaled)
+                if max(result["seconds"] for result in scaled) > budget:
+                    break
+        finally:
+            os.chdir(working_directory)
+    return results
+
+
+def commit() -> str:
+    """
+    This function returns the git commit of the repository, if there is one.
+    :return: the hash of the current commit, or None if it cannot be found
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(seed: int, repeats: int, budget: float) -> dict:
+    """
+    This function runs every benchmark.
+    :param seed: the seed of the random generators of the synthetic workloads
+    :param repeats: the number of times to time each call
+    :param budget: the time in seconds a size of a scaled benchmark may take before larger sizes are skipped
+    :return: a dictionary with the environment of the run and the list of results
+    """
+    results = bench_vocabularies(repeats) + bench_synthetic_words(seed, repeats, budget) + \
+        bench_datasets(seed, repeats, budget)
+    return {"commit": commit(), "python": platform.python_version(), "numpy": np.__version__,
+            "pandas": pd.__version__, "seed": seed, "repeats": repeats, "budget": budget, "results": results}
+
+
+def compare(old: dict, new: dict) -> list[str]:
+    """
+    This function compares two runs of the benchmarks.
+    :param old: the runs as returned by <run>
+    :param new: the runs as returned by <run>
+    :return: a line for each benchmark and size in both runs, with the times and the ratio of the new time to the old
+    """
+    old_times = {(result["name"], result["size"]): result["seconds"] for result in old["results"]}
+    lines = []
+    for result in new["results"]:
+        key = (result["name"], result["size"])
+        if key in old_times:
+            lines.append("{} [{}]: {:.4f}s -> {:.4f}s ({:.2f}x)".format(
+                result["name"], result["size"], old_times[key], result["seconds"],
+                result["seconds"] / old_times[key] if old_times[key] else float("nan")))
+    return lines
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the word decoder and the confusability analysis.")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the synthetic workloads")
+    parser.add_argument("--repeats", type=int, default=3, help="number of times each call is timed")
+    parser.add_argument("--budget", type=float, default=TIME_BUDGET,
+                        help="seconds a size may take before larger sizes are skipped")
+    parser.add_argument("--output", help="JSON file to save the results in, by default results/<commit>.json")
+    parser.add_argument("--compare", help="JSON file of an earlier run to compare the results with")
+    arguments = parser.parse_args()
+
+    benchmarks = run(arguments.seed, arguments.repeats, arguments.budget)
+    output = arguments.output
+    if output is None:
+        os.makedirs(OUTPUT, exist_ok=True)
+        output = os.path.join(OUTPUT, (benchmarks["commit"] or "local")[:12] + ".json")
+    with open(output, "w") as f:
+        json.dump(benchmarks, f, indent=2)
+
+    if arguments.compare is not None:
+        with open(arguments.compare) as f:
+            print("\n".join(compare(json.load(f), benchmarks)))
+    else:
+        for benchmark in benchmarks["results"]:
+            print("{} [{}]: {:.4f}s".format(benchmark["name"], benchmark["size"], benchmark["seconds"]))
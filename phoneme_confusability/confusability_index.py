@@ -0,0 +1,141 @@
+"""
+This module answers the question "which phonemes are most confusable with a given phoneme?" for the datasets analysed
+in confusion_matrix.py. The normalised overlap / correlation values of a dataset are sorted once for every phoneme, so
+that the top-k most confusable phonemes, or all the phonemes that are at least as confusable as a given score, can be
+found for many phonemes in one call. Queries can also be run over several datasets at once.
+
+A higher normalised value means that two phonemes are more similar, and hence more confusable.
+"""
+import glob
+import os
+from typing import Union
+
+import numpy as np
+from numpy import ndarray
+
+import confusion_matrix
+
+
+class ConfusabilityIndex:
+    """
+    The phonemes of a dataset, each with the other phonemes of the dataset sorted from the most to the least
+    confusable.
+
+    === Attributes ===
+    phonemes: the phonemes of the dataset
+    index: a dictionary with the phonemes as keys and their position in <phonemes> as values
+    scores: a square matrix, where the value at [i, j] is the normalised value of phonemes i and j
+    neighbours: a matrix with a row for each phoneme, containing the positions of the other phonemes from the most to
+    the least confusable with it, with the phonemes whose value is NaN last
+    sorted_scores: the normalised values in the same order as <neighbours>
+    """
+    phonemes: list[str]
+    index: dict[str, int]
+    scores: ndarray
+    neighbours: ndarray
+    sorted_scores: ndarray
+
+    def __init__(self, phonemes: list[str], scores: ndarray) -> None:
+        """
+        Sort the phonemes by how confusable they are with each phoneme.
+        :param phonemes: the phonemes of the dataset, in the order of the rows and columns of <scores>
+        :param scores: a square matrix, where the value at [i, j] is the normalised value of phonemes i and j
+        """
+        self.phonemes = list(phonemes)
+        self.index = {phoneme: i for i, phoneme in enumerate(self.phonemes)}
+        self.scores = np.asarray(scores, dtype=float)
+
+        # a NaN value, e.g., the correlation of a phoneme whose features are all the same, is sorted as the least
+        # confusable; ties keep the order of the file. A phoneme is not its own neighbour, so it is left out of its row
+        size = len(self.phonemes)
+        order = np.argsort(-np.where(np.isnan(self.scores), -np.inf, self.scores), axis=1, kind="stable")
+        self.neighbours = order[order != np.arange(size)[:, None]].reshape(size, max(size - 1, 0))
+        self.sorted_scores = np.take_along_axis(self.scores, self.neighbours, axis=1)
+
+    def top_k(self, phonemes: Union[str, list[str]], k: int) -> dict[str, list[tuple[str, float]]]:
+        """
+        Return the <k> phonemes that are most confusable with each of the given phonemes.
+        :param phonemes: a phoneme or a list of phonemes of the dataset
+        :param k: the number of neighbours to return for each phoneme
+        :return: a dictionary with the given phonemes as keys and lists of (phoneme, normalised value) tuples as
+        values, from the most to the least confusable
+        """
+        phonemes = [phonemes] if isinstance(phonemes, str) else phonemes
+        rows = np.array([self.index[phoneme] for phoneme in phonemes], dtype=int)
+        neighbours = self.neighbours[rows, :k]
+        scores = self.sorted_scores[rows, :k]
+        return {phoneme: [(self.phonemes[j], float(score)) for j, score in zip(neighbours[i], scores[i])]
+                for i, phoneme in enumerate(phonemes)}
+
+    def within(self, phonemes: Union[str, list[str]], min_score: float) -> dict[str, list[tuple[str, float]]]:
+        """
+        Return the phonemes whose normalised value with each of the given phonemes is at least <min_score>.
+        :param phonemes: a phoneme or a list of phonemes of the dataset
+        :param min_score: the lowest normalised value of the neighbours to return
+        :return: a dictionary with the given phonemes as keys and lists of (phoneme, normalised value) tuples as
+        values, from the most to the least confusable
+        """
+        phonemes = [phonemes] if isinstance(phonemes, str) else phonemes
+        rows = np.array([self.index[phoneme] for phoneme in phonemes], dtype=int)
+
+        # the values of each row are sorted, so the neighbours within the score are a prefix of the row
+        counts = np.sum(self.sorted_scores[rows] >= min_score, axis=1)
+        return {phoneme: [(self.phonemes[j], float(score)) for j, score in
+                          zip(self.neighbours[rows[i], :counts[i]], self.sorted_scores[rows[i], :counts[i]])]
+                for i, phoneme in enumerate(phonemes)}
+
+
+def load_index(fil: str, overlap: bool, from_results: bool = False) -> ConfusabilityIndex:
+    """
+    This function returns the confusability index of a dataset.
+    :param fil: a .txt file that contains the phonemes and their features as values between -1 to 1
+    :param overlap: if true, use the normalised overlap values, else the correlation values
+    :param from_results: if true, read the values stored in the binary format in the Results directory (see
+    <load_scores> in confusion_matrix.py) instead of computing them from <fil>
+    :return: the confusability index of the dataset
+    """
+    if from_results:
+        phonemes, scores = confusion_matrix.load_scores(fil, overlap)
+    else:
+        table = confusion_matrix.load_feature_table(fil)
+        phonemes, scores = table.phonemes, table.pair_scores(overlap)
+    return ConfusabilityIndex(phonemes, scores)
+
+
+def top_k_all(indexes: dict[str, ConfusabilityIndex], phonemes: Union[str, list[str]], k: int) -> \
+        dict[str, dict[str, list[tuple[str, float]]]]:
+    """
+    This function finds the <k> most confusable phonemes for each of the given phonemes in every dataset. Phonemes that
+    are not in a dataset are left out of the results of that dataset.
+    :param indexes: a dictionary with the names of the datasets as keys and their confusability indexes as values
+    :param phonemes: a phoneme or a list of phonemes
+    :param k: the number of neighbours to return for each phoneme
+    :return: a dictionary with the names of the datasets as keys and the results of <top_k> as values
+    """
+    phonemes = [phonemes] if isinstance(phonemes, str) else phonemes
+    return {name: index.top_k([phoneme for phoneme in phonemes if phoneme in index.index], k)
+            for name, index in indexes.items()}
+
+
+def within_all(indexes: dict[str, ConfusabilityIndex], phonemes: Union[str, list[str]], min_score: float) -> \
+        dict[str, dict[str, list[tuple[str, float]]]]:
+    """
+    This function finds the phonemes whose normalised value with each of the given phonemes is at least <min_score> in
+    every dataset. Phonemes that are not in a dataset are left out of the results of that dataset.
+    :param indexes: a dictionary with the names of the datasets as keys and their confusability indexes as values
+    :param phonemes: a phoneme or a list of phonemes
+    :param min_score: the lowest normalised value of the neighbours to return
+    :return: a dictionary with the names of the datasets as keys and the results of <within> as values
+    """
+    phonemes = [phonemes] if isinstance(phonemes, str) else phonemes
+    return {name: index.within([phoneme for phoneme in phonemes if phoneme in index.index], min_score)
+            for name, index in indexes.items()}
+
+
+if __name__ == "__main__":
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    all_indexes = {fil: load_index(fil, True) for fil in glob.glob('*.txt')}
+
+    # uncomment the following lines to see the phonemes most confusable with /p/ and /s/ in every dataset
+    # for dataset, neighbours in top_k_all(all_indexes, ["p", "s"], 5).items():
+    #     print(dataset, neighbours)
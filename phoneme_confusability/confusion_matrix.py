@@ -17,6 +17,52 @@ import numpy as np
 from numpy import ndarray
 from pandas import DataFrame
 import glob
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+RESULTS = os.path.join(pathlib.Path(__file__).parent, "Results")  # the directory the results are stored in
+
+# the phonological feature vectors of the Pho_Train_PatGen.awk file in the RHUL_HSModels directory, which are a
+# replication of the HS99 dataset with minor tweaks. They are the source of the pho_train_pat_gen.txt dataset and of the
+# phonological vectors of pattern_generator.py.
+PHO_TRAIN_PAT_GEN = {"p": [1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                     "b": [1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                     "t": [0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                     "d": [0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                     "k": [0, 0, 0, 0, 1, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                     "g": [0, 0, 0, 0, 1, 0, 1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                     "f": [1, 1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                     "v": [1, 1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                     "T": [0, 1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                     "D": [0, 1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                     "s": [0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                     "z": [0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                     "S": [0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                     "Z": [0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                     "h": [0, 0, 0, 0, 0, 1, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                     "C": [0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                     "J": [0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                     "m": [1, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                     "n": [0, 0, 1, 0, 0, 0, 0, 0, 0, 1, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                     "G": [0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                     "l": [0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                     "r": [0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 1, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0],
+                     "w": [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                     "y": [0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                     "i": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 0, 0, 1, 0, 0, 1, 0, 0, 0, 0, 0],
+                     "I": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0],
+                     "e": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 0, 0, 0, 1, 0, 1, 0, 0, 0, 0, 0],
+                     "E": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0],
+                     "a": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0],
+                     "@": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 1, 0, 0, 1, 0, 0, 0, 0, 0, 0],
+                     "u": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 1, 1, 0, 0, 1, 0, 1, 0, 0, 0],
+                     "U": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 1, 1, 0, 0, 0, 0, 1, 0, 0, 0],
+                     "o": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 1, 0, 1, 0, 1, 0, 1, 0, 0, 0],
+                     "^": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 1, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0],
+                     "Y": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 1, 1, 0, 0, 1, 0, 1, 1, 0, 0],
+                     "A": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0],
+                     "W": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 1],
+                     "O": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 1, 0, 1, 0, 1, 0, 1, 0, 1, 0]}
 
 
 def read_file(fil: str) -> str:
@@ -101,6 +147,129 @@ def feature_vector(feature_list: list[list[str]], phoneme_list: list[str]) -> di
     return phoneme_dic
 
 
+class FeatureTable:
+    """
+    The phonemes and feature values of a dataset .txt file, parsed in a single read of the file. Use
+    <load_feature_table> to get the table of a file, so that each file is only parsed once while it is unchanged.
+
+    === Attributes ===
+    file: the .txt file the table was read from
+    phonemes: the phonemes of the dataset, in the order of the file
+    index: a dictionary with the phonemes as keys and their row in <features> as values
+    features: an array with one row for each phoneme and one column for each feature, containing the feature values as
+    they appear in the file
+    values: <features> as floats
+    line_count: the number of nonempty lines in the file, as returned by <get_file_length>
+    """
+    file: str
+    phonemes: list[str]
+    index: dict[str, int]
+    features: ndarray
+    values: ndarray
+    line_count: int
+    _scores: dict[bool, ndarray]
+
+    def __init__(self, fil: str) -> None:
+        """
+        Parse the dataset in <fil>.
+        :param fil: a .txt file that contains the phonemes and their features as values between -1 to 1
+        """
+        with open(fil) as f:
+            lines = f.readlines()
+        self.file = fil
+        self.line_count = len([line for line in lines if line != "\n"])
+        phoneme_list = [phoneme.strip() for phoneme in lines[0].split(",")[1:]]
+        feature_list = [[value.strip() for value in line.split(",")] for line in lines[1:]]
+        phoneme_dic = feature_vector(feature_list, phoneme_list)
+        self.phonemes = list(phoneme_dic)
+        self.index = {phoneme: i for i, phoneme in enumerate(self.phonemes)}
+        self.features = np.array(list(phoneme_dic.values()))
+        self.values = self.features.astype(float)
+        self._scores = {}
+
+    def pair_scores(self, overlap: bool) -> ndarray:
+        """
+        Return the normalised confusability score of every phoneme pairing at full precision. The scores are only
+        computed once for each method.
+        :param overlap: if true, the number of features common for each phoneme pair divided by <line_count>, else the
+        correlation for each phoneme pair
+        :return: a square float array, where the value at [i, j] is the score of phonemes i and j
+        """
+        if overlap not in self._scores:
+            if overlap:
+                self._scores[overlap] = overlap_matrix(self.features) / self.line_count
+            else:
+                self._scores[overlap] = correlation_matrix(self.features)
+        return self._scores[overlap]
+
+
+def align_tables(tables: list[FeatureTable]) -> tuple[list[str], list[ndarray]]:
+    """
+    This function maps the phonemes that are in all the given tables into a shared index.
+    :param tables: the feature tables of the datasets to align
+    :return: a tuple containing the list of phonemes common to all tables, in the order of the first table, and for
+    each table an array with the row of each common phoneme in that table
+    """
+    common = [phoneme for phoneme in tables[0].phonemes if all(phoneme in table.index for table in tables[1:])]
+    return common, [np.array([table.index[phoneme] for phoneme in common], dtype=int) for table in tables]
+
+
+_feature_tables = {}  # the parsed tables of the files read so far, with the modification time of each file
+
+
+def load_feature_table(fil: str) -> FeatureTable:
+    """
+    This function returns the parsed feature table of a dataset .txt file. Tables are kept in memory and the file is
+    only parsed again if it has been modified since it was last read.
+    :param fil: a .txt file that contains the phonemes and their features as values between -1 to 1
+    :return: the feature table of the file
+    """
+    path = os.path.abspath(fil)
+    modified = os.path.getmtime(path)
+    if path not in _feature_tables or _feature_tables[path][0] != modified:
+        _feature_tables[path] = (modified, FeatureTable(fil))
+    return _feature_tables[path][1]
+
+
+def overlap_matrix(features: ndarray) -> ndarray:
+    """
+    This function finds the overlap value of every phoneme pairing at once, i.e., the number of feature values that
+    each phoneme pairing has in common. Each feature value is one-hot encoded, so that the overlap of all pairings is a
+    single matrix product of the encoded features with themselves.
+    :param features: an array with one row for each phoneme and one column for each feature, containing the feature
+    values as they appear in the file
+    :return: a square integer array, where the value at [i, j] is the overlap value of phonemes i and j
+    """
+    n_phonemes, n_features = features.shape
+    values, codes = np.unique(features, return_inverse=True)  # the same code for the same value in any feature
+    codes = codes.reshape(n_phonemes, n_features) + np.arange(n_features) * len(values)
+    one_hot = np.zeros((n_phonemes, n_features * len(values)))
+    one_hot[np.repeat(np.arange(n_phonemes), n_features), codes.ravel()] = 1
+    return np.rint(one_hot @ one_hot.T).astype(int)
+
+
+def correlation_matrix(features: ndarray) -> ndarray:
+    """
+    This function finds the correlation for the featural values of every phoneme pairing at once.
+    :param features: an array with one row for each phoneme and one column for each feature, containing the feature
+    values as they appear in the file
+    :return: a square float array, where the value at [i, j] is the correlation between phonemes i and j
+    """
+    return np.corrcoef(features.astype(float))
+
+
+def upper_triangle(matrix: ndarray) -> tuple[ndarray, ndarray, ndarray]:
+    """
+    This function returns the values of a square pairwise matrix for each phoneme pairing without duplicates, i.e.,
+    the values above the diagonal, in the order the pairings are found in the file.
+    :param matrix: a square array of values for each pair of phonemes
+    :return: a tuple containing the index of the first phoneme, the index of the second phoneme and the value for each
+    phoneme pairing
+    """
+    first, second = np.triu_indices(matrix.shape[0], 1)
+    return first, second, matrix[first, second]
+
+
 def get_overlap(phoneme_dic: dict[str, list[str]]) -> list[Union[list[list[str]], list[int]]]:
     """
     This function finds the overlap value for each phoneme pairing in the data, i.e., the number of feature values that
@@ -108,25 +277,10 @@ def get_overlap(phoneme_dic: dict[str, list[str]]) -> list[Union[list[list[str]]
     :param phoneme_dic: a dictionary that contains phonemes as keys and a list of featural values as its value
     :return: a list containing a list of phoneme pairings and a list containing overlap values
     """
-    phoneme_pairings = []
-    overlap_values = []
-    temp = []  # list to store phoneme pairings that have already been stored in the dictionary to avoid duplicates
-    for key in phoneme_dic:
-        for key2 in phoneme_dic:
-
-            # check point to avoid adding same keys and phoneme pairings already in temp
-            if key2 != key and [key, key2] not in temp and [key2, key] not in temp:
-                j = 0  # counter for overlap values between each phoneme
-                for k in range(len(phoneme_dic[key])):
-                    if phoneme_dic[key][k] == phoneme_dic[key2][k]:
-                        j += 1
-                phoneme_pairings.append([key, key2])  # add phoneme pair to the list
-                overlap_values.append(j)  # store overlap values at the corresponding index in a different list
-
-                # store the phoneme pairs already analysed in temp
-                temp.append([key, key2])
-                temp.append([key2, key])
-    return [phoneme_pairings, overlap_values]
+    phonemes = list(phoneme_dic)
+    first, second, values = upper_triangle(overlap_matrix(np.array(list(phoneme_dic.values()))))
+    phoneme_pairings = [[phonemes[i], phonemes[j]] for i, j in zip(first, second)]
+    return [phoneme_pairings, values.tolist()]
 
 
 def get_phoneme_corr(phoneme_dic: dict[str, list[str]]) -> list[Union[list[list[str]], list[ndarray]]]:
@@ -135,25 +289,10 @@ def get_phoneme_corr(phoneme_dic: dict[str, list[str]]) -> list[Union[list[list[
     :param phoneme_dic: a dictionary that contains phonemes as keys and a list of featural values as its value
     :return: a list containing a list of phoneme pairings and a list containing correlation values
     """
-    phoneme_pairings = []
-    corr_values = []
-    temp = []  # list to store phoneme pairings that have already been stored in the dictionary to avoid duplicates
-    for key in phoneme_dic:
-        for key2 in phoneme_dic:
-
-            # check point to avoid adding same keys and phoneme pairings already in temp
-            if key2 != key and [key, key2] not in temp and [key2, key] not in temp:
-                corr = np.corrcoef(list(np.float_(phoneme_dic[key])), list(np.float_(phoneme_dic[key2])))
-                corr[1][0] = round(corr[1][0], 2)
-                phoneme_pairings.append([key, key2])  # add phoneme pair to the list
-
-                # store correlation values at the corresponding index in a different list
-                corr_values.append(corr[1][0])
-
-                # store the phoneme pairs already analysed in temp
-                temp.append([key, key2])
-                temp.append([key2, key])
-    return [phoneme_pairings, corr_values]
+    phonemes = list(phoneme_dic)
+    first, second, values = upper_triangle(correlation_matrix(np.array(list(phoneme_dic.values()))))
+    phoneme_pairings = [[phonemes[i], phonemes[j]] for i, j in zip(first, second)]
+    return [phoneme_pairings, list(np.round(values, 2))]
 
 
 def confusion_matrix(phoneme_tuple_dic: dict[tuple, int]) -> DataFrame:
@@ -165,81 +304,172 @@ def confusion_matrix(phoneme_tuple_dic: dict[tuple, int]) -> DataFrame:
     as values
     :return: a confusion matrix dataframe
     """
-    first_col = []
-    first_row = []
-    for key in phoneme_tuple_dic:
-        first_col.append(key[0])  # add the first phoneme in the tuple to the first column
-        first_row.append(key[1])  # add the second phoneme in the tuple to the first row
+    # the first phonemes of the tuples index the rows and the second phonemes index the columns, without duplicates
+    phoneme_1 = {phoneme: i for i, phoneme in enumerate(dict.fromkeys(key[0] for key in phoneme_tuple_dic))}
+    phoneme_2 = {phoneme: i for i, phoneme in enumerate(dict.fromkeys(key[1] for key in phoneme_tuple_dic))}
 
-    # remove duplicates from both the lists
-    phoneme_1 = list(dict.fromkeys(first_col))
-    phoneme_2 = list(dict.fromkeys(first_row))
+    # scatter the normalised overlap / correlation values into the matrix, the other cells are left empty
+    matrix = np.full((len(phoneme_1), len(phoneme_2)), np.nan)
+    matrix[[phoneme_1[key[0]] for key in phoneme_tuple_dic],
+           [phoneme_2[key[1]] for key in phoneme_tuple_dic]] = list(phoneme_tuple_dic.values())
+    return _matrix_dataframe(list(phoneme_1), list(phoneme_2), matrix)
 
-    # make a pandas dataframe with the first column and the first row
-    confusion_mat = pd.DataFrame(list(phoneme_1), columns=["phonemes"])
-    confusion_mat = confusion_mat.reindex(columns=confusion_mat.columns.tolist() + phoneme_2)
 
-    # fill in the dataframe with the normalised overlap / correlation values
-    for col in confusion_mat.columns[1:]:
-        for k in range(len(phoneme_1)):
-            if (confusion_mat["phonemes"][k], col) in phoneme_tuple_dic:
-                confusion_mat.at[k, col] = phoneme_tuple_dic[confusion_mat["phonemes"][k], col]
+def score_confusion_matrix(phonemes: list[str], scores: ndarray, symmetric: bool = False) -> DataFrame:
+    """
+    This function generates the confusion matrix of a dataset directly from the square matrix of its normalised
+    overlap / correlation values.
+    :param phonemes: the phonemes of the dataset, in the order of the rows and columns of <scores>
+    :param scores: a square matrix, where the value at [i, j] is the score of phonemes i and j
+    :param symmetric: if true, the confusion matrix has a row and a column for every phoneme and contains every
+    pairing in both orders, including each phoneme with itself. Otherwise it only contains each pairing once, in the
+    same layout as <confusion_matrix> gives for the pairs of <normalised_dataframe>.
+    :return: a confusion matrix dataframe
+    """
+    if symmetric:
+        return _matrix_dataframe(phonemes, phonemes, np.array(scores, dtype=float))
+    upper = np.where(np.triu(np.ones(scores.shape, dtype=bool), 1), scores, np.nan)
+    return _matrix_dataframe(phonemes[:-1], phonemes[1:], upper[:-1, 1:])
+
+
+def _matrix_dataframe(phoneme_1: list[str], phoneme_2: list[str], matrix: ndarray) -> DataFrame:
+    """
+    This function wraps a matrix of scores as a confusion matrix dataframe.
+    :param phoneme_1: the phonemes of the rows of <matrix>
+    :param phoneme_2: the phonemes of the columns of <matrix>
+    :param matrix: the scores, with NaN for the cells that are left empty
+    :return: a dataframe with the phonemes of the rows in the first column and the phonemes of the columns as the
+    names of the other columns
+    """
+    confusion_mat = pd.DataFrame(matrix, columns=phoneme_2)
+    confusion_mat.insert(0, "phonemes", phoneme_1)
     return confusion_mat
 
 
-def normalised_dataframe(files: list[str], overlap: bool) -> list[DataFrame]:
+def normalised_dataframe(files: list[str], overlap: bool, binary: bool = False, csv: bool = True) -> list[DataFrame]:
     """
     This function returns a list containing dataframes and stores it in a .csv file. The dataframe contains phoneme
     pairings and their normalised values.
     :param files: a list containing .txt files from which to read data
     :param overlap: if true, find the number of features common for each phoneme pair, else find the correlation for
     each phoneme pair
+    :param binary: if true, also store the normalised values of each file at full precision in the binary format read
+    by <load_scores>
+    :param csv: if false, the dataframes are not stored in .csv files
     :return: a list of dataframes that contain phoneme pairings and their normalised confusability values.
     """
     tracker = []  # a list to store the dataframes generated for both datasets
     for fil in files:
-        line_count = get_file_length(fil)
-        feature_lis = get_features(fil)  # get the feature list for the phonemes
-        phoneme_lis = get_phonemes(fil)  # get the list of phonemes from the file
-        dictionary = feature_vector(feature_lis, phoneme_lis)  # get the feature vectors for the phonemes
-        if overlap:
-            arr = get_overlap(dictionary)  # get the overlap values for the phoneme pairings
-        else:
-            arr = get_phoneme_corr(dictionary)
-        # make a dataframe with phoneme pairings column and overlap / correlation values column
-        df = pd.DataFrame(list(zip(arr[0], arr[1])), columns=['phonemes', 'overlap / correlation'])
-        arr = list(df['overlap / correlation'].copy())
-
-        if overlap:  # normalise the overlap values
-            for j in range(len(arr)):
-                arr[j] = round(arr[j] / line_count, 2)
-        df['overlap / correlation'] = arr  # change the overlap column of the dataframe to normalised values
+        table = load_feature_table(fil)  # the file is only parsed once while it is unchanged
+        df = pair_dataframe(table, overlap)
         tracker.append(df)  # add the dataframe to the tracker
 
-        # output filename
-        dot_index = fil.index(".")
-        file_name = fil[:dot_index]
-        parent_dir = pathlib.Path(__file__).parent
-
-        # directory for output file
-        directory = "Results"
-        path = os.path.join(parent_dir, directory)
-        if not os.path.isdir(path):
-            os.mkdir(path)
-        directory = fil
-        parent_dir = path
-        path = os.path.join(parent_dir, directory)
-        if not os.path.isdir(path):
-            os.mkdir(path)
-
-        # store the dataframe in a .csv format
-        if overlap:
-            tracker[files.index(fil)].to_csv(path + "/" + file_name + '_overlap.csv')
-        else:
-            tracker[files.index(fil)].to_csv(path + "/" + file_name + '_correlation.csv')
+        # store the dataframe in a .csv format and / or the scores in the binary format
+        results = binary_results(fil, table, overlap) if binary else {}
+        if csv:
+            results[pair_dataframe_name(fil, overlap)] = df
+        write_results(results)
     return tracker
 
 
+def pair_dataframe(table: FeatureTable, overlap: bool) -> DataFrame:
+    """
+    This function returns the dataframe of phoneme pairings and their normalised values for a dataset.
+    :param table: the feature table of the dataset
+    :param overlap: if true, find the number of features common for each phoneme pair, else find the correlation for
+    each phoneme pair
+    :return: a dataframe that contains phoneme pairings and their normalised confusability values
+    """
+    first, second, values = upper_triangle(table.pair_scores(overlap))
+
+    # make a dataframe with phoneme pairings column and normalised overlap / correlation values column
+    phoneme_pairings = [[table.phonemes[i], table.phonemes[j]] for i, j in zip(first, second)]
+    return pd.DataFrame({'phonemes': phoneme_pairings, 'overlap / correlation': np.round(values, 2)})
+
+
+def pair_dataframe_name(fil: str, overlap: bool) -> str:
+    """
+    This function returns the path of the .csv file of the normalised dataframe of a dataset, relative to the Results
+    directory.
+    :param fil: a .txt file that contains the phonemes and their features as values between -1 to 1
+    :param overlap: if true, the path for the overlap method, else the path for the correlation method
+    :return: the path of the .csv file
+    """
+    file_name = fil[:fil.index(".")]
+    if overlap:
+        return fil + "/" + file_name + '_overlap.csv'
+    return fil + "/" + file_name + '_correlation.csv'
+
+
+def scores_name(fil: str, overlap: bool) -> str:
+    """
+    This function returns the path of the .npy file that holds the normalised values of a dataset at full precision,
+    relative to the Results directory.
+    :param fil: a .txt file that contains the phonemes and their features as values between -1 to 1
+    :param overlap: if true, the path for the overlap method, else the path for the correlation method
+    :return: the path of the .npy file
+    """
+    return pair_dataframe_name(fil, overlap)[:-len(".csv")] + ".npy"
+
+
+def phonemes_name(fil: str) -> str:
+    """
+    This function returns the path of the .json file that holds the phonemes of a dataset in the order of the rows and
+    columns of its .npy files, relative to the Results directory.
+    :param fil: a .txt file that contains the phonemes and their features as values between -1 to 1
+    :return: the path of the .json file
+    """
+    return fil + "/" + fil[:fil.index(".")] + "_phonemes.json"
+
+
+def binary_results(fil: str, table: FeatureTable, overlap: bool) -> dict[str, Union[ndarray, list[str]]]:
+    """
+    This function returns the results of a dataset in the binary format: the square matrix of normalised values at
+    full precision and the phonemes that index its rows and columns.
+    :param fil: a .txt file that contains the phonemes and their features as values between -1 to 1
+    :param table: the feature table of <fil>
+    :param overlap: if true, find the number of features common for each phoneme pair, else find the correlation for
+    each phoneme pair
+    :return: a dictionary with the paths of the files relative to the Results directory as keys and the matrix and the
+    list of phonemes as values
+    """
+    return {scores_name(fil, overlap): table.pair_scores(overlap), phonemes_name(fil): table.phonemes}
+
+
+def write_results(results: dict[str, Union[DataFrame, ndarray, list[str]]]) -> None:
+    """
+    This function stores results in the Results directory next to this module, creating the directories that do not
+    exist yet. Dataframes are stored as .csv files, arrays as .npy files and lists of phonemes as .json files.
+    :param results: a dictionary with the paths of the files relative to the Results directory as keys and the results
+    to store as values
+    :return: None
+    """
+    for name, result in results.items():
+        os.makedirs(os.path.dirname(os.path.join(RESULTS, name)), exist_ok=True)
+        if isinstance(result, DataFrame):
+            result.to_csv(RESULTS + "/" + name)
+        elif isinstance(result, ndarray):
+            np.save(RESULTS + "/" + name, result)
+        else:
+            with open(RESULTS + "/" + name, "w", encoding="utf-8") as f:
+                json.dump(result, f, ensure_ascii=False)
+
+
+def load_scores(fil: str, overlap: bool, mmap: bool = True) -> tuple[list[str], ndarray]:
+    """
+    This function loads the normalised values of a dataset stored in the binary format by <normalised_dataframe>,
+    <make_conf_matrix> or <analyse_files>.
+    :param fil: the .txt file the values were computed for
+    :param overlap: if true, load the values of the overlap method, else the values of the correlation method
+    :param mmap: if true, the matrix is memory-mapped from the file instead of being read into memory
+    :return: a tuple containing the list of phonemes and the square matrix whose value at [i, j] is the normalised
+    value of phonemes i and j
+    """
+    with open(RESULTS + "/" + phonemes_name(fil), encoding="utf-8") as f:
+        phonemes = json.load(f)
+    return phonemes, np.load(RESULTS + "/" + scores_name(fil, overlap), mmap_mode="r" if mmap else None)
+
+
 def find_correlation(file1: str, file2: str, overlap: bool) -> tuple[ndarray, str]:
     """
     This functions finds the phoneme pairs that are the same in the two .txt files and reports the correlation between
@@ -251,80 +481,78 @@ def find_correlation(file1: str, file2: str, overlap: bool) -> tuple[ndarray, st
     :return: a tuple containing the numpy array with the correlation values and the number of phoneme pairs that the
     two files have in common
     """
-    tracker = normalised_dataframe([file1, file2], overlap)
-    similarity_list = {}  # dictionary with phoneme pairings and normalised values in the dataset for the given files
-    phoneme_1_copy = list(tracker[0]["phonemes"].copy())
-    phoneme_2_copy = list(tracker[1]["phonemes"].copy())
-    overlap_1_copy = list(tracker[0]["overlap / correlation"].copy())
-    overlap_2_copy = list(tracker[1]["overlap / correlation"].copy())
-    corr_1 = []
-    corr_2 = []
-    common_pairs = 0
-    # check what phoneme pairs are common across both dataframes
-    for j in range(len(phoneme_1_copy)):
-        x = tuple(phoneme_1_copy[j])
-        if phoneme_1_copy[j] in phoneme_2_copy:
-            y = phoneme_2_copy.index(phoneme_1_copy[j])
-            similarity_list[x] = (overlap_1_copy[j], overlap_2_copy[y])  # copy the overlap values for the phoneme pairs
-            # in both dataframes
-
-            # store overlap values in different lists at corresponding indices for correlation analysis
-            corr_1.append(overlap_1_copy[j])
-            corr_2.append(overlap_2_copy[y])
-            common_pairs += 1
-        else:
-            new_lis = [x[1], x[0]]
-            new_tup = (x[1], x[0])
-            if new_lis in phoneme_2_copy:
-                y = phoneme_2_copy.index(new_lis)
-                similarity_list[new_tup] = (overlap_1_copy[j], overlap_2_copy[y])  # copy the overlap values for the
-                # phoneme pair in both dataframes
-
-                # store overlap values in different lists at corresponding indices for correlation analysis
-                corr_1.append(overlap_1_copy[j])
-                corr_2.append(overlap_2_copy[y])
-                common_pairs += 1
+    corr, common_pairs = dataset_correlation(load_feature_table(file1), load_feature_table(file2), overlap)
     if overlap:
         x = "overlap"
     else:
         x = "correlation"
-    return round(np.corrcoef(corr_1, corr_2)[1][0], 2), "The number of common_pairs for " + file1 + " " + file2 + \
+    return corr, "The number of common_pairs for " + file1 + " " + file2 + \
         " for " + x + " method is " + str(common_pairs)
 
 
-def make_conf_matrix(fil: str, overlap: bool) -> None:
+def dataset_correlation(table_1: FeatureTable, table_2: FeatureTable, overlap: bool) -> tuple[ndarray, int]:
+    """
+    This function finds the correlation between the normalised values of the phoneme pairs that are in both datasets.
+    :param table_1: the feature table of the first dataset
+    :param table_2: the feature table of the second dataset
+    :param overlap: if true, find the number of features common for each phoneme pair, else find the correlation for
+    each phoneme pair
+    :return: a tuple containing the correlation rounded to 2 decimal places and the number of phoneme pairs that the
+    two datasets have in common
+    """
+    rows_1, rows_2 = align_tables([table_1, table_2])[1]  # the rows of the phonemes common to both datasets
+
+    # the normalised values of the phoneme pairs common to both datasets, at corresponding indices
+    corr_1 = upper_triangle(np.round(table_1.pair_scores(overlap)[np.ix_(rows_1, rows_1)], 2))[2]
+    corr_2 = upper_triangle(np.round(table_2.pair_scores(overlap)[np.ix_(rows_2, rows_2)], 2))[2]
+    return round(np.corrcoef(corr_1, corr_2)[1][0], 2), len(corr_1)
+
+
+def make_conf_matrix(fil: str, overlap: bool, binary: bool = False, csv: bool = True, symmetric: bool = False) -> None:
     """
     This function returns the confusion matrix with the correlation or normalised overlap values between phoneme pairs
     in a .csv file.
     :param fil: a .txt file that contains the phonemes and their features as values between -1 to 1
     :param overlap: if true, find the number of features common for each phoneme pair, else find the correlation for
     each phoneme pair
+    :param binary: if true, also store the normalised values at full precision in the binary format read by
+    <load_scores>
+    :param csv: if false, the confusion matrix is not stored in a .csv file
+    :param symmetric: if true, the confusion matrix contains every phoneme pairing in both orders, as described in
+    <score_confusion_matrix>
     :return: None
     """
-    df_tracker = normalised_dataframe([fil], overlap)
-    phoneme_copy = list(df_tracker[0]["phonemes"].copy())
-    overlap_copy = list(df_tracker[0]["overlap / correlation"].copy())
-    matrix = {}
-    for j in range(len(phoneme_copy)):
-        tup_matrix = tuple(phoneme_copy[j])
-        matrix[tup_matrix] = overlap_copy[j]
-    confusion = confusion_matrix(matrix)
-    dot_index = fil.index(".")
-    file_name = fil[:dot_index] + '_conf_matrix'
-    parent_dir = pathlib.Path(__file__).parent
-    directory = "Results"
-    path = os.path.join(parent_dir, directory)
-    if not os.path.isdir(path):
-        os.mkdir(path)
-    directory = fil
-    parent_dir = path
-    path = os.path.join(parent_dir, directory)
-    if not os.path.isdir(path):
-        os.mkdir(path)
+    normalised_dataframe([fil], overlap, binary, csv)
+    if csv:
+        write_results({conf_matrix_name(fil, overlap): conf_matrix_dataframe(load_feature_table(fil), overlap,
+                                                                             symmetric)})
+
+
+def conf_matrix_dataframe(table: FeatureTable, overlap: bool, symmetric: bool = False) -> DataFrame:
+    """
+    This function returns the confusion matrix of a dataset with the normalised values rounded to 2 decimal places.
+    :param table: the feature table of the dataset
+    :param overlap: if true, find the number of features common for each phoneme pair, else find the correlation for
+    each phoneme pair
+    :param symmetric: if true, the confusion matrix contains every phoneme pairing in both orders, as described in
+    <score_confusion_matrix>
+    :return: a confusion matrix dataframe
+    """
+    return score_confusion_matrix(table.phonemes, np.round(table.pair_scores(overlap), 2), symmetric)
+
+
+def conf_matrix_name(fil: str, overlap: bool) -> str:
+    """
+    This function returns the path of the .csv file of the confusion matrix of a dataset, relative to the Results
+    directory.
+    :param fil: a .txt file that contains the phonemes and their features as values between -1 to 1
+    :param overlap: if true, the path for the overlap method, else the path for the correlation method
+    :return: the path of the .csv file
+    """
+    file_name = fil[:fil.index(".")] + '_conf_matrix'
     if overlap:
-        confusion.to_csv(path + '/' + file_name + '_overlap.csv')
-    else:
-        confusion.to_csv(path + '/' + file_name + '_correlation.csv')
+        return fil + '/' + file_name + '_overlap.csv'
+    return fil + '/' + file_name + '_correlation.csv'
 
 
 def dic_to_txt(name: str, phoneme_dic: dict[str, list[int]]) -> None:
@@ -358,30 +586,90 @@ def corr_files(all_fil: list[str], overlap: bool) -> None:
     each phoneme pair
     :return: None
     """
+    tables = [load_feature_table(fil) for fil in all_fil]
+    write_results({corr_files_name(overlap): corr_dataframe(all_fil, tables, overlap)})
+
+
+def corr_dataframe(all_fil: list[str], tables: list[FeatureTable], overlap: bool) -> DataFrame:
+    """
+    This function returns the matrix of the correlation between each pair of datasets.
+    :param all_fil: a list of .txt files for which the user wants to find the correlation
+    :param tables: the feature tables of the files in <all_fil>, in the same order
+    :param overlap:  if true, find the number of features common for each phoneme pair, else find the correlation for
+    each phoneme pair
+    :return: a dataframe with a row and a column for each file, where the upper triangle contains the correlations
+    """
     dic = {}
     confusion_mat = pd.DataFrame(all_fil, columns=["Files"])
     confusion_mat = confusion_mat.reindex(columns=confusion_mat.columns.tolist() + all_fil)
     for j in range(len(all_fil)):
         for k in range(j + 1, len(all_fil)):
-            if overlap:
-                corr = find_correlation(all_fil[j], all_fil[k], True)
-                dic[(all_fil[j], all_fil[k])] = corr[0]
-            else:
-                corr = find_correlation(all_fil[j], all_fil[k], False)
-                dic[(all_fil[j], all_fil[k])] = corr[0]
+            dic[(all_fil[j], all_fil[k])] = dataset_correlation(tables[j], tables[k], overlap)[0]
     for col in confusion_mat.columns[1:]:
         for k in range(len(all_fil)):
             if (confusion_mat["Files"][k], col) in dic:
                 confusion_mat.at[k, col] = dic[confusion_mat["Files"][k], col]
-    parent_dir = pathlib.Path(__file__).parent
-    directory = "Results"
-    path = os.path.join(parent_dir, directory)
-    if not os.path.isdir(path):
-        os.mkdir(path)
+    return confusion_mat
+
+
+def corr_files_name(overlap: bool) -> str:
+    """
+    This function returns the path of the .csv file of the matrix made by <corr_files>, relative to the Results
+    directory.
+    :param overlap: if true, the path for the overlap method, else the path for the correlation method
+    :return: the path of the .csv file
+    """
     if overlap:
-        confusion_mat.to_csv(path + '/' + 'overlap.csv')
-    else:
-        confusion_mat.to_csv(path + '/' + 'correlation.csv')
+        return 'overlap.csv'
+    return 'correlation.csv'
+
+
+def _analyse_file(fil: str, binary: bool, csv: bool) -> tuple[FeatureTable, dict]:
+    """
+    This function computes the normalised dataframes and the confusion matrices of one dataset in a worker process.
+    :param fil: a .txt file that contains the phonemes and their features as values between -1 to 1
+    :param binary: if true, include the normalised values in the binary format
+    :param csv: if true, include the normalised dataframes and the confusion matrices
+    :return: a tuple containing the feature table of the file with the scores of both methods computed, and a
+    dictionary with the paths of the files relative to the Results directory as keys and the results as values
+    """
+    table = load_feature_table(fil)
+    results = {}
+    for overlap in [False, True]:
+        if binary:
+            results.update(binary_results(fil, table, overlap))
+        if csv:
+            results[pair_dataframe_name(fil, overlap)] = pair_dataframe(table, overlap)
+            results[conf_matrix_name(fil, overlap)] = conf_matrix_dataframe(table, overlap)
+    return table, results
+
+
+def analyse_files(all_fil: list[str], processes: int = None, binary: bool = False, csv: bool = True) -> dict:
+    """
+    This function produces every result of this module for a list of datasets in one pass: the confusion matrices and
+    the normalised dataframes of each dataset, and the matrices of the correlation between each pair of datasets, for
+    both the overlap and the correlation method. Each dataset is parsed and scored exactly once, in a pool of
+    processes, and nothing is written to disk; pass the result to <write_results> to store all of it at once.
+    :param all_fil: a list of .txt files that contain the phonemes and their features as values between -1 to 1
+    :param processes: the number of worker processes. All the cores of the machine are used if not passed.
+    :param binary: if true, include the normalised values of each dataset in the binary format read by <load_scores>
+    :param csv: if false, leave out the normalised dataframes and the confusion matrices, which are only needed for the
+    .csv export
+    :return: a dictionary with the paths of the files relative to the Results directory as keys and the results as
+    values
+    """
+    processes = os.cpu_count() if processes is None else processes
+    with ProcessPoolExecutor(max_workers=max(1, min(processes, len(all_fil)))) as executor:
+        analysed = list(executor.map(_analyse_file, all_fil, [binary] * len(all_fil), [csv] * len(all_fil)))
+    results = {}
+    for table, dataframes in analysed:
+        results.update(dataframes)
+
+    # the correlations between datasets only need the scores already computed by the workers
+    tables = [table for table, dataframes in analysed]
+    for overlap in [False, True]:
+        results[corr_files_name(overlap)] = corr_dataframe(all_fil, tables, overlap)
+    return results
 
 
 if __name__ == "__main__":
@@ -393,60 +681,13 @@ if __name__ == "__main__":
     # dictionary of vectors to be converted to .txt format
     # these values were obtained from Pho_Train_PatGen.awk file in the RHUL_HSModels directory in the repository
     # these are a replication of HS99 dataset with minor tweaks
-    dic_to_txt("pho_train_pat_gen.txt",
-               {"p": [1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                "b": [1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                "t": [0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                "d": [0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                "k": [0, 0, 0, 0, 1, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                "g": [0, 0, 0, 0, 1, 0, 1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                "f": [1, 1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                "v": [1, 1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                "T": [0, 1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                "D": [0, 1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                "s": [0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                "z": [0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                "S": [0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                "Z": [0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                "h": [0, 0, 0, 0, 0, 1, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                "C": [0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                "J": [0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                "m": [1, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                "n": [0, 0, 1, 0, 0, 0, 0, 0, 0, 1, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                "G": [0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                "l": [0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                "r": [0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 1, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0],
-                "w": [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                "y": [0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                "i": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 0, 0, 1, 0, 0, 1, 0, 0, 0, 0, 0],
-                "I": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0],
-                "e": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 0, 0, 0, 1, 0, 1, 0, 0, 0, 0, 0],
-                "E": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0],
-                "a": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0],
-                "@": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 1, 0, 0, 1, 0, 0, 0, 0, 0, 0],
-                "u": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 1, 1, 0, 0, 1, 0, 1, 0, 0, 0],
-                "U": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 1, 1, 0, 0, 0, 0, 1, 0, 0, 0],
-                "o": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 1, 0, 1, 0, 1, 0, 1, 0, 0, 0],
-                "^": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 1, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0],
-                "Y": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 1, 1, 0, 0, 1, 0, 1, 1, 0, 0],
-                "A": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0],
-                "W": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 1],
-                "O": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 1, 0, 1, 0, 1, 0, 1, 0, 1, 0]})
+    dic_to_txt("pho_train_pat_gen.txt", PHO_TRAIN_PAT_GEN)
 
     os.chdir("phoneme_confusability")
     all_files = glob.glob('*.txt')
-    # make a confusion matrix and output to csv for any .txt file in the specified format
-    for file in all_files:
-        make_conf_matrix(file, False)
-        make_conf_matrix(file, True)
-
-    # find the correlation between correlation values between .txt files using correlation and overlap methods
-    corr_files(all_files, False)
-    corr_files(all_files, True)
-
-    # normalise the correlation values for phoneme pairs and output it to .csv file for a list of .txt files
-    normalised_dataframe(all_files, False)
-    normalised_dataframe(all_files, True)
+    # make a confusion matrix, find the correlation between .txt files and normalise the values for phoneme pairs using
+    # correlation and overlap methods for any .txt file in the specified format, and output everything to csv at once
+    write_results(analyse_files(all_files, binary=True))
 
     # change the path according to the csv that needs conversion
     # phoneme strings do not get mapped exactly to html, but this can be a good tool for visualisation of results
@@ -0,0 +1,158 @@
+"""
+This module stores the example sets of the triangle models in the RHUL_HSModels directory in a compact binary layout
+that is memory-mapped when it is loaded, so analyses can take any subset of the examples without reading or parsing
+the corpus text files.
+
+An example set is a directory that contains:
+- index.json: the words of the set and their forms as written in the corpus file, and the number of units of each layer
+- frequency.npy: the frequency of each word
+- <layer>.npy for each layer: the binary vector of each word in the layer, with the bits packed 8 to a byte
+
+The 6k corpus of HS04 (6k_AllReps_8Slot_NxF) is stored with its orthographic, phonological and semantic layers, i.e.,
+the vectors of all the .pat files made by pattern_generator.py. The 3k corpus of HS99 (3k_99_trans) is stored with its
+orthographic layer, as used by mkpat_read99_hs.awk. Its phonological features are not binary, so its phonological forms
+are only kept in the index.
+"""
+import json
+import os
+
+import numpy as np
+from numpy import ndarray
+
+import pattern_generator
+
+HS99_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "RHUL_HSModels", "RHUL_HS99", "HS99",
+                         "3k_99_trans")
+HS99_ORTHOGRAPHIC_SLOTS = slice(1, 11)  # the slots of the HS99 orthographic forms used by mkpat_read99_hs.awk
+EXAMPLE_SETS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ExampleSets")  # where example sets are stored
+
+
+class ExampleSet:
+    """
+    An example set loaded from its directory. The frequencies and the packed vectors are memory-mapped, so slicing them
+    with a range of rows does not copy any data.
+
+    === Attributes ===
+    words: the words of the set
+    index: a dictionary with the words as keys and the list of their rows as values. A word can have more than one row,
+    e.g., the 6k corpus has a row for each meaning of a homograph such as "bass".
+    forms: a dictionary with the names of the forms (e.g., "phonology") as keys and the form of each word as values
+    frequencies: the frequency of each word
+    units: a dictionary with the layers as keys and the number of units of each layer as values
+    packed: a dictionary with the layers as keys and the packed vectors of the words as values
+    """
+    words: list[str]
+    index: dict[str, list[int]]
+    forms: dict[str, list[str]]
+    frequencies: ndarray
+    units: dict[str, int]
+    packed: dict[str, ndarray]
+
+    def __init__(self, directory: str) -> None:
+        """
+        Load the example set stored in <directory> by <write_example_set>.
+        :param directory: the directory of the example set
+        """
+        with open(os.path.join(directory, "index.json"), encoding="utf-8") as f:
+            index = json.load(f)
+        self.words = index["words"]
+        self.index = {}
+        for i, word in enumerate(self.words):
+            self.index.setdefault(word, []).append(i)
+        self.forms = index["forms"]
+        self.units = index["units"]
+        self.frequencies = np.load(os.path.join(directory, "frequency.npy"), mmap_mode="r")
+        self.packed = {layer: np.load(os.path.join(directory, layer + ".npy"), mmap_mode="r") for layer in self.units}
+
+    def rows(self, words: list[str]) -> ndarray:
+        """
+        Return the rows of the given words.
+        :param words: a list of words of the set
+        :return: an array with every row of each word, in the order of <words> and then of the rows
+        """
+        return np.array([i for word in words for i in self.index[word]], dtype=int)
+
+    def vectors(self, layer: str, rows=None) -> ndarray:
+        """
+        Return the unpacked vectors of the words in a layer.
+        :param layer: a layer of <units>
+        :param rows: the rows to return, as a slice or an array of rows. All the rows are returned if not passed.
+        :return: an array with the binary vector of each word as uint8 values
+        """
+        packed = self.packed[layer] if rows is None else self.packed[layer][rows]
+        return np.unpackbits(packed, axis=1, count=self.units[layer])
+
+
+def write_example_set(directory: str, words: list[str], forms: dict[str, list[str]], frequencies: ndarray,
+                      layers: dict[str, ndarray]) -> None:
+    """
+    This function stores an example set in a directory, creating it if it does not exist yet.
+    :param directory: the directory to store the example set in
+    :param words: the words of the set
+    :param forms: a dictionary with the names of the forms as keys and the form of each word as values
+    :param frequencies: the frequency of each word
+    :param layers: a dictionary with the layers as keys and the binary vectors of the words as values, with one row for
+    each word
+    :return: None
+    """
+    os.makedirs(directory, exist_ok=True)
+    vectors = {layer: np.asarray(layers[layer]).reshape(len(words), -1) for layer in layers}
+    with open(os.path.join(directory, "index.json"), "w", encoding="utf-8") as f:
+        json.dump({"words": words, "forms": forms, "units": {layer: vectors[layer].shape[1] for layer in vectors}}, f,
+                  ensure_ascii=False)
+    np.save(os.path.join(directory, "frequency.npy"), np.asarray(frequencies, dtype=float))
+    for layer in vectors:
+        np.save(os.path.join(directory, layer + ".npy"), np.packbits(vectors[layer].astype(bool), axis=1))
+
+
+def convert_6k(corpus_file: str = pattern_generator.CORPUS_FILE, directory: str = None) -> str:
+    """
+    This function stores the HS04 corpus as an example set with its orthographic, phonological and semantic layers.
+    :param corpus_file: a corpus file arranged as 6k_AllReps_8Slot_NxF
+    :param directory: the directory to store the example set in. ExampleSets/6k is used if not passed.
+    :return: the directory of the example set
+    """
+    directory = os.path.join(EXAMPLE_SETS, "6k") if directory is None else directory
+    corpus = pattern_generator.read_corpus(corpus_file)
+    write_example_set(directory, corpus.words, {"orthography": corpus.orthography, "phonology": corpus.phonology},
+                      corpus.frequencies, {layer: corpus.vectors(layer)
+                                           for layer in ["orthography", "phonology", "semantic"]})
+    return directory
+
+
+def convert_3k(corpus_file: str = HS99_FILE, directory: str = None) -> str:
+    """
+    This function stores the HS99 corpus as an example set with its orthographic layer.
+    :param corpus_file: a tab separated file arranged as 3k_99_trans: word, slot based orthographic form, phonological
+    form and frequency
+    :param directory: the directory to store the example set in. ExampleSets/3k is used if not passed.
+    :return: the directory of the example set
+    """
+    directory = os.path.join(EXAMPLE_SETS, "3k") if directory is None else directory
+    with open(corpus_file) as f:
+        rows = [line.split() for line in f if line.strip()]
+    codes = np.array([[pattern_generator.ORTHOGRAPHIC_CODES[letter] for letter in row[1][HS99_ORTHOGRAPHIC_SLOTS]]
+                      for row in rows], dtype=np.uint8)
+    write_example_set(directory, [row[0] for row in rows], {"orthography": [row[1] for row in rows],
+                                                            "phonology": [row[2] for row in rows]},
+                      np.array([float(row[3]) for row in rows]),
+                      {"orthography": pattern_generator.ORTHOGRAPHIC_VECTORS[codes]})
+    return directory
+
+
+def load_example_set(directory: str) -> ExampleSet:
+    """
+    This function loads an example set stored by <write_example_set>.
+    :param directory: the directory of the example set
+    :return: the example set
+    """
+    return ExampleSet(directory)
+
+
+if __name__ == "__main__":
+    # store both corpora as example sets in the ExampleSets directory
+    examples_6k = load_example_set(convert_6k())
+    examples_3k = load_example_set(convert_3k())
+
+    # uncomment the following line to see the semantic vectors of the first ten words of the 6k corpus
+    # print(examples_6k.vectors("semantic", slice(0, 10)))
@@ -0,0 +1,233 @@
+"""
+This module generates the training patterns of the triangle model replication in the RHUL_HSModels directory, in place
+of the awk scripts in RHUL_HS04/HS04_Model4Replication/Patterns. The corpus is read once, the input and target vectors
+of each training task are produced as NumPy arrays a batch of words at a time, and the Mikenet .pat files are only
+written when they are asked for. A .pat file written by this module is identical to the output of the awk script of the
+same task.
+
+The phonological vectors come from PHO_TRAIN_PAT_GEN in confusion_matrix.py, the same feature table the
+pho_train_pat_gen.txt dataset of the confusability analysis is made from.
+
+Precondition: every row of the corpus file is formatted as described in README_Patterns.txt: word, frequency, slot
+based orthographic form, slot based phonological form, and the indices of the active semantic features.
+"""
+import os
+from typing import Iterator
+
+import numpy as np
+from numpy import ndarray
+
+import confusion_matrix
+
+CORPUS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "RHUL_HSModels", "RHUL_HS04",
+                           "HS04_Model4Replication", "Patterns", "6k_AllReps_8Slot_NxF")
+ORTHOGRAPHIC_SLOTS = 14
+PHONOLOGICAL_SLOTS = 8
+SEMANTIC_UNITS = 2446  # number of units of the binary semantic feature vectors
+BLANK = "_"  # an empty slot, coded as a vector of zeros
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+# the line of the .pat header of each task, the PROB line, and the (CLAMP / TARGET, layer, time steps) of each section
+TASKS = {"Pho": ("TAG Word: {word} Pho: {phonology} Ortho {orthography}", "PROB  {probability}",
+                 [("CLAMP", "phonology", "0-6"), ("TARGET", "phonology", "7-ALL")]),
+         "Sem": ("TAG Word: {word}", "PROB {probability}",
+                 [("CLAMP", "semantic", "0-6"), ("TARGET", "semantic", "7-ALL")]),
+         "Pho2Sem": ("TAG Word: {word} Pho: {phonology}", "PROB {probability}",
+                     [("CLAMP", "phonology", "0-7"), ("TARGET", "phonology", "8-ALL"),
+                      ("TARGET", "semantic", "8-ALL")]),
+         "Sem2Pho": ("TAG Word: {word} Pho: {phonology}", "PROB {probability}",
+                     [("CLAMP", "semantic", "0-7"), ("TARGET", "semantic", "8-ALL"),
+                      ("TARGET", "phonology", "8-ALL")]),
+         "Read": ("TAG Word: {word} Ortho: {orthography} Pho: {phonology}", "PROB {probability}",
+                  [("CLAMP", "orthography", "0-ALL"), ("TARGET", "semantic", "8-ALL"),
+                   ("TARGET", "phonology", "8-ALL")])}
+
+
+def _code_table(vectors: dict[str, list[int]]) -> tuple[dict[str, int], ndarray]:
+    """
+    This function numbers the symbols of a slot based form, with the blank slot as symbol 0.
+    :param vectors: a dictionary with the symbols as keys and their feature vectors as values
+    :return: a tuple containing a dictionary with the symbols as keys and their numbers as values, and an array whose
+    row i is the feature vector of symbol i
+    """
+    width = len(next(iter(vectors.values())))
+    codes = {BLANK: 0}
+    codes.update({symbol: i + 1 for i, symbol in enumerate(vectors)})
+    return codes, np.array([[0] * width] + list(vectors.values()), dtype=np.uint8)
+
+
+ORTHOGRAPHIC_CODES, ORTHOGRAPHIC_VECTORS = _code_table({letter: [int(letter == other) for other in LETTERS]
+                                                        for letter in LETTERS})
+PHONOLOGICAL_CODES, PHONOLOGICAL_VECTORS = _code_table(confusion_matrix.PHO_TRAIN_PAT_GEN)
+
+
+class Corpus:
+    """
+    The words of a corpus file with their frequencies and their orthographic, phonological and semantic forms.
+
+    === Attributes ===
+    words: the words of the corpus, in the order of the file
+    probabilities: the frequency of each word as it is written in the file
+    frequencies: the frequency of each word
+    orthography: the slot based orthographic form of each word
+    phonology: the slot based phonological form of each word
+    orthographic_codes: a matrix with a row for each word, containing the number of the letter in each slot
+    phonological_codes: a matrix with a row for each word, containing the number of the phoneme in each slot
+    semantic_features: the indices of the active semantic features of all the words, one word after the other
+    semantic_offsets: the position in <semantic_features> where the features of each word start, followed by the
+    number of features of all the words
+    """
+    words: list[str]
+    probabilities: list[str]
+    frequencies: ndarray
+    orthography: list[str]
+    phonology: list[str]
+    orthographic_codes: ndarray
+    phonological_codes: ndarray
+    semantic_features: ndarray
+    semantic_offsets: ndarray
+
+    def __init__(self, file: str) -> None:
+        """
+        Read the corpus in <file>.
+        :param file: a corpus file arranged as 6k_AllReps_8Slot_NxF
+        """
+        with open(file) as f:
+            rows = [line.split() for line in f if line.strip()]
+        self.words = [row[0] for row in rows]
+        self.probabilities = [row[1] for row in rows]
+        self.frequencies = np.array([float(row[1]) for row in rows])
+        self.orthography = [row[2] for row in rows]
+        self.phonology = [row[3] for row in rows]
+        self.orthographic_codes = np.array([[ORTHOGRAPHIC_CODES[letter] for letter in row[2]] for row in rows],
+                                           dtype=np.uint8).reshape(len(rows), ORTHOGRAPHIC_SLOTS)
+        self.phonological_codes = np.array([[PHONOLOGICAL_CODES[phoneme] for phoneme in row[3]] for row in rows],
+                                           dtype=np.uint8).reshape(len(rows), PHONOLOGICAL_SLOTS)
+        self.semantic_features = np.array([int(feature) for row in rows for feature in row[4:]], dtype=np.int32)
+        self.semantic_offsets = np.cumsum([0] + [len(row) - 4 for row in rows])
+
+    def orthographic_vectors(self, rows: ndarray = None) -> ndarray:
+        """
+        Return the orthographic vectors of the words.
+        :param rows: the positions of the words to return. All the words are returned if not passed.
+        :return: an array of shape (words, slots, letters) with a one-hot letter vector for each slot
+        """
+        codes = self.orthographic_codes if rows is None else self.orthographic_codes[rows]
+        return ORTHOGRAPHIC_VECTORS[codes]
+
+    def phonological_vectors(self, rows: ndarray = None) -> ndarray:
+        """
+        Return the phonological vectors of the words.
+        :param rows: the positions of the words to return. All the words are returned if not passed.
+        :return: an array of shape (words, slots, features) with the feature vector of the phoneme in each slot
+        """
+        codes = self.phonological_codes if rows is None else self.phonological_codes[rows]
+        return PHONOLOGICAL_VECTORS[codes]
+
+    def semantic_vectors(self, rows: ndarray = None) -> ndarray:
+        """
+        Return the binary semantic vectors of the words.
+        :param rows: the positions of the words to return. All the words are returned if not passed.
+        :return: an array of shape (words, SEMANTIC_UNITS) with a 1 for every active semantic feature
+        """
+        rows = np.arange(len(self.words)) if rows is None else np.asarray(rows)
+        counts = self.semantic_offsets[rows + 1] - self.semantic_offsets[rows]
+        features = np.concatenate([self.semantic_features[self.semantic_offsets[row]:self.semantic_offsets[row + 1]]
+                                   for row in rows]) if len(rows) else np.zeros(0, dtype=int)
+        vectors = np.zeros((len(rows), SEMANTIC_UNITS), dtype=np.uint8)
+        vectors[np.repeat(np.arange(len(rows)), counts), features] = 1
+        return vectors
+
+    def vectors(self, layer: str, rows: ndarray = None) -> ndarray:
+        """
+        Return the vectors of the words for a layer of the model.
+        :param layer: "orthography", "phonology" or "semantic"
+        :param rows: the positions of the words to return. All the words are returned if not passed.
+        :return: the vectors described in the method of the layer
+        """
+        if layer == "orthography":
+            return self.orthographic_vectors(rows)
+        if layer == "phonology":
+            return self.phonological_vectors(rows)
+        return self.semantic_vectors(rows)
+
+
+_corpora = {}  # the corpora read so far, with the modification time of each file
+
+
+def read_corpus(file: str = CORPUS_FILE) -> Corpus:
+    """
+    This function returns the corpus in a file. Corpora are kept in memory and the file is only read again if it has
+    been modified since it was last read.
+    :param file: a corpus file arranged as 6k_AllReps_8Slot_NxF
+    :return: the corpus of the file
+    """
+    path = os.path.abspath(file)
+    modified = os.path.getmtime(path)
+    if path not in _corpora or _corpora[path][0] != modified:
+        _corpora[path] = (modified, Corpus(file))
+    return _corpora[path][1]
+
+
+def iter_patterns(corpus: Corpus, task: str, batch_size: int = 1024) -> \
+        Iterator[tuple[list[str], dict[str, ndarray], dict[str, ndarray]]]:
+    """
+    This function yields the input and target vectors of the training patterns of a task, a batch of words at a time.
+    :param corpus: the corpus to make the patterns of
+    :param task: a task of <TASKS>, e.g., "Sem2Pho"
+    :param batch_size: the number of words in each batch
+    :return: a generator of tuples containing the words of the batch, a dictionary with the clamped layers as keys and
+    their vectors as values, and a dictionary with the target layers as keys and their vectors as values
+    """
+    sections = TASKS[task][2]
+    for start in range(0, len(corpus.words), batch_size):
+        rows = np.arange(start, min(start + batch_size, len(corpus.words)))
+        vectors = {layer: corpus.vectors(layer, rows) for layer in dict.fromkeys(layer for _, layer, _ in sections)}
+        clamps = {layer: vectors[layer] for kind, layer, _ in sections if kind == "CLAMP"}
+        targets = {layer: vectors[layer] for kind, layer, _ in sections if kind == "TARGET"}
+        yield corpus.words[start:rows[-1] + 1], clamps, targets
+
+
+def _slot_lines(vectors: ndarray) -> list[str]:
+    """
+    This function returns the .pat line of each symbol of a slot based form, as the awk scripts print them.
+    :param vectors: an array whose row i is the feature vector of symbol i
+    :return: the line of each symbol
+    """
+    return [" ".join(str(value) for value in vector) + " \n" for vector in vectors]
+
+
+def write_pat(corpus: Corpus, task: str, out_file: str) -> None:
+    """
+    This function writes the Mikenet training patterns of a task to a .pat file, in the same format as the awk script
+    of the task.
+    :param corpus: the corpus to make the patterns of
+    :param task: a task of <TASKS>, e.g., "Sem2Pho"
+    :param out_file: the .pat file to write
+    :return: None
+    """
+    tag, probability, sections = TASKS[task]
+    lines = {"orthography": (_slot_lines(ORTHOGRAPHIC_VECTORS), corpus.orthographic_codes),
+             "phonology": (_slot_lines(PHONOLOGICAL_VECTORS), corpus.phonological_codes)}
+    with open(out_file, "w") as f:
+        for i, word in enumerate(corpus.words):
+            f.write(tag.format(word=word, orthography=corpus.orthography[i], phonology=corpus.phonology[i]) + "\n")
+            f.write(probability.format(probability=corpus.probabilities[i]) + "\n")
+            for kind, layer, steps in sections:
+                if layer == "semantic":
+                    f.write(kind + " " + layer + " " + steps + " SPARSE\n")
+                    features = corpus.semantic_features[corpus.semantic_offsets[i]:corpus.semantic_offsets[i + 1]]
+                    f.write("".join(str(feature) + " " for feature in features) + ",\n")
+                else:
+                    f.write(kind + " " + layer + " " + steps + " FULL\n")
+                    slot_lines, codes = lines[layer]
+                    f.write("".join(slot_lines[code] for code in codes[i]))
+            f.write(";\n")
+
+
+if __name__ == "__main__":
+    corpus_6k = read_corpus()
+
+    # uncomment the following line to write the patterns of a task to a .pat file, e.g., for the semantic to phonology
+    # task. The tasks are the keys of TASKS.
+    # write_pat(corpus_6k, "Sem2Pho", "6k_Sem2Pho_Train.pat")
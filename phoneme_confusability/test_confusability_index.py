@@ -0,0 +1,35 @@
+"""
+Tests for confusability_index.py.
+"""
+import numpy as np
+import pytest
+
+import confusion_matrix
+from confusability_index import ConfusabilityIndex
+
+
+def test_nan_scores_are_least_confusable_and_self_is_left_out() -> None:
+    nan = float("nan")
+    index = ConfusabilityIndex(["a", "b", "c"], np.array([[nan, .5, .2], [.5, 1, nan], [.2, nan, 1]]))
+    top = index.top_k(["a", "b", "c"], 2)
+    assert top["a"] == [("b", .5), ("c", .2)]
+    assert [phoneme for phoneme, _ in top["b"]] == ["a", "c"]
+    assert [phoneme for phoneme, _ in top["c"]] == ["a", "b"]
+    assert np.isnan(top["b"][1][1])
+    assert index.within("b", 0) == {"b": [("a", .5)]}
+
+
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+def test_zero_variance_features(tmp_path) -> None:
+    # the features of "z" are all the same, so its correlation with every phoneme is NaN
+    dataset = tmp_path / "flat.txt"
+    dataset.write_text("Features, p, b, m, z\nf0, 1, 1, -1, 0\nf1, 1, -1, -1, 0\nf2, -1, 1, 1, 0")
+    table = confusion_matrix.load_feature_table(str(dataset))
+    scores = table.pair_scores(False)
+    assert np.isnan(scores[table.phonemes.index("z")]).all()
+    index = ConfusabilityIndex(table.phonemes, scores)
+    for phoneme in table.phonemes:
+        neighbours = [neighbour for neighbour, _ in index.top_k(phoneme, 3)[phoneme]]
+        assert phoneme not in neighbours
+        assert sorted(neighbours) == sorted(set(table.phonemes) - {phoneme})
+    assert index.top_k("p", 3)["p"][-1][0] == "z"
@@ -0,0 +1,95 @@
+"""
+This module decodes large lists of words, e.g., the whole 6k corpus of HS04 or 3k corpus of HS99, across a pool of
+processes. The words are normalised and deduplicated first, so every unique word is only decoded once, and the unique
+words are split into chunks that are decoded by the workers. The phoneme dictionary and its grapheme trie are sent to
+each worker process once when it starts, rather than with every chunk.
+
+The result is the same dictionary that <decode_words> in decoder.py returns, with the words in the order they first
+appear in the input.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Union
+
+import curricula_analysis
+import decoder
+
+CHUNKS_PER_PROCESS = 8  # chunks made for each worker process, so that a chunk of slow words does not hold up the pool
+
+_shared = {}  # the phoneme dictionary, trie and greedy mode of a worker process, set by <_init_worker>
+
+
+def _init_worker(phoneme_dict: dict[str, list[str]], trie: dict, greedy: str) -> None:
+    """
+    This function is run once in every worker process and stores the data that every chunk is decoded with.
+    :param phoneme_dict: a dictionary containing grapheme-phoneme correspondences
+    :param trie: a trie of the graphemes in <phoneme_dict> built by <build_grapheme_trie> in decoder.py
+    :param greedy: described in the decode_words function in decoder.py module
+    :return: None
+    """
+    _shared["phoneme_dict"] = phoneme_dict
+    _shared["trie"] = trie
+    _shared["greedy"] = greedy
+
+
+def _decode_chunk(chunk: list[str]) -> list:
+    """
+    This function decodes a chunk of unique words in a worker process.
+    :param chunk: a list of normalised words that are all different
+    :return: a list with the value that <decode_words> returns for each word of the chunk, in the order of the chunk
+    """
+    transcriptions = decoder.decode_words(chunk, _shared["phoneme_dict"], _shared["greedy"], _shared["trie"])
+    return [transcriptions[word] for word in chunk]
+
+
+def decode_batch(words: list[str], phoneme_dict: dict[str, list[str]], greedy: str, processes: int = None,
+                 chunk_size: int = None) -> Union[dict[str, list[str]], dict[str, dict[int, list[str]]]]:
+    """
+    This function decodes a list of words in the same way as <decode_words> in decoder.py, across a pool of processes.
+    :param words: List of words to be decoded into IPA
+    :param phoneme_dict: a dictionary containing grapheme-phoneme correspondences
+    :param greedy: described in the decode_words function in decoder.py module
+    :param processes: the number of worker processes. All the cores of the machine are used if not passed. The words
+    are decoded in this process if it is 1.
+    :param chunk_size: the number of unique words in each chunk. The unique words are split into
+    <CHUNKS_PER_PROCESS> chunks for each process if it is not passed.
+    :return: the dictionary returned by <decode_words>, with the words in the order they first appear in <words>
+    """
+    unique = list(dict.fromkeys(word.lower().strip() for word in words))  # the words as decode_words stores them
+    trie = decoder.build_grapheme_trie(phoneme_dict)
+    processes = os.cpu_count() if processes is None else processes
+    if processes <= 1 or len(unique) <= 1:
+        return decoder.decode_words(unique, phoneme_dict, greedy, trie)
+
+    if chunk_size is None:
+        chunk_size = -(-len(unique) // (processes * CHUNKS_PER_PROCESS))
+    chunks = [unique[start:start + chunk_size] for start in range(0, len(unique), chunk_size)]
+    with ProcessPoolExecutor(max_workers=min(processes, len(chunks)), initializer=_init_worker,
+                             initargs=(phoneme_dict, trie, greedy)) as executor:
+        results = [value for values in executor.map(_decode_chunk, chunks) for value in values]
+    return dict(zip(unique, results))
+
+
+def decode_corpus(phoneme_dict: dict[str, list[str]], greedy: str, corpus: str = "6k", processes: int = None) -> \
+        Union[dict[str, list[str]], dict[str, dict[int, list[str]]]]:
+    """
+    This function decodes every word of a corpus across a pool of processes.
+    :param phoneme_dict: a dictionary containing grapheme-phoneme correspondences
+    :param greedy: described in the decode_words function in decoder.py module
+    :param corpus: a corpus of <FREQUENCY_CORPORA> in curricula_analysis.py
+    :param processes: described in <decode_batch>
+    :return: the dictionary returned by <decode_words>, with the words in the order of the corpus file
+    """
+    return decode_batch(list(curricula_analysis.get_frequency_index(corpus)), phoneme_dict, greedy, processes)
+
+
+if __name__ == "__main__":
+    phonemes = decoder.read_orthography("phoneme dictionary.xlsx - Sheet1.csv")
+
+    # decode every word of the HS04 corpus across all the cores of the machine. Change "6k" to "3k" for HS99, and 'big'
+    # to 'small' or 'no' for other modes.
+    corpus_ipa = decode_corpus(phonemes, 'big', "6k")
+
+    # uncomment the following line to see the output
+    # print(corpus_ipa)
@@ -11,12 +11,27 @@ files. For any further clarifications, please reach out to shysta.sehgal@mail.ut
 
 """
 
+import os
+from typing import Union
+
 import pandas
 import decoder
 import pandas as pd
+import decode_profile
+import phoneme_distance
 
 JP = 5
 LS = 6
+TRICKY_TYPES = ["Tricky word", "Exception-implicit"]  # types of words that are taught as a whole to the students
+
+# the corpora with word frequencies in the RHUL_HSModels directory, with the column of the frequency in each file
+MODELS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "phoneme_confusability",
+                      "RHUL_HSModels")
+FREQUENCY_CORPORA = {"6k": (os.path.join(MODELS, "RHUL_HS04", "HS04_Model4Replication", "Patterns",
+                                         "6k_AllReps_8Slot_NxF"), 1),
+                     "3k": (os.path.join(MODELS, "RHUL_HS99", "HS99", "3k_99_trans"), 3)}
+
+_frequency_indexes = {}  # the frequency indexes built so far, with the modification time of each corpus file
 
 
 def get_curricula_vocabulary(file: str, month: int) -> pandas.DataFrame:
@@ -91,7 +106,9 @@ def get_curricula_gpcs(file: str, month: int) -> dict[str, list[str]]:
     return gpc_dic
 
 
-def get_transcription(df: pandas.DataFrame, phoneme_dic: dict[str, list[str]], greedy: str) -> tuple[float, int]:
+def get_transcription(df: pandas.DataFrame, phoneme_dic: dict[str, list[str]], greedy: str,
+                      distance: phoneme_distance.WeightedEditDistance = None) -> \
+        Union[tuple[float, int], tuple[float, int, float]]:
     """
     This function returns the percentage of words correctly decoded from the dataframe depending on the rules taught in
     the dictionary. The user can choose different modes for reading of the words: big, small, and no as described in
@@ -100,61 +117,294 @@ def get_transcription(df: pandas.DataFrame, phoneme_dic: dict[str, list[str]], g
     a word.
     :param phoneme_dic: a dictionary with graphemes as keys and phoneme correspondences as a list as respective values
     :param greedy: described in the decode_words function in decoder.py module
+    :param distance: if passed, also measure how close the words that were decoded incorrectly came to their coded
+    phonology with this distance
     :return: a tuple containing the percentage of correct words read, and the number of tricky words that could not
     decoded with the dictionary rules but were included in the correct words read (because these were taught to the
-    students)
-    """
-    orthography = df["Orthography"].tolist()
-    for i in range(len(orthography)):
-        orthography[i] = orthography[i].lower()
-        orthography[i] = orthography[i].strip()
-
-    # get the transcriptions for the dataframe depending on the greedy mode
-    transcriptions = decoder.decode_words(orthography, phoneme_dic, greedy)
-    phonology = df["Phonology"].tolist()
-    for i in range(len(phonology)):
-        phonology[i] = phonology[i].strip()
-
-    # to keep track of the explicit and implicit tricky words that could not be decoded from the rules in the dictionary
-    type_list = df["Type"].tolist()
-    count = 0  # words read correctly
-    tricky_count = 0
-    seen = []  # to keep track of pronunciations already accounted for in order to avoid duplicates
+    students). If <distance> is passed, the tuple also contains the mean closest miss described in <get_closest_miss>.
+    """
+    records = get_word_records(df, phoneme_dic, greedy, distance)
+    if distance is None:
+        return get_accuracy(records)
+    return get_accuracy(records) + (get_closest_miss(records),)
+
+
+def get_word_records(df: pandas.DataFrame, phoneme_dic: dict[str, list[str]], greedy: str,
+                     distance: phoneme_distance.WeightedEditDistance = None) -> pandas.DataFrame:
+    """
+    This function decodes every word of the dataframe with the rules taught in the dictionary and returns a record of
+    the result for each word. Each unique word, and each unique pair of word and phonology, is only decoded once.
+    :param df: A Pandas DataFrame with rows containing information about the month, phonology, orthography, et cetera of
+    a word.
+    :param phoneme_dic: a dictionary with graphemes as keys and phoneme correspondences as a list as respective values
+    :param greedy: described in the decode_words function in decoder.py module
+    :param distance: if passed, the records also contain a "Closest miss" column with the distance from the coded
+    phonology of each word to its closest transcription: 0 for correct words and NaN for words that are not decodable
+    :return: the records described in <score_words>, with one row for each row of <df>
+    """
+    orthography = df["Orthography"].str.lower().str.strip().tolist()
+    phonology = df["Phonology"].str.strip().tolist()
+    words = list(dict.fromkeys(orthography))
+    pairs = list(dict.fromkeys(zip(orthography, phonology)))
     if greedy == 'small' or greedy == 'big':
-        for i in range(len(phonology)):
-            if transcriptions[orthography[i]] == {}:
-                if type_list[i] == "Tricky word":
-                    count += 1
-                    tricky_count += 1
-                elif type_list[i] == "Exception-implicit":
-                    count += 1
-                    tricky_count += 1
-            else:
-                for key in transcriptions[orthography[i]]:
-                    if phonology[i] not in seen:
-                        seen.append(phonology[i])
-                        if phonology[i] in transcriptions[orthography[i]][key]:
-                            count += 1
-                        elif type_list[i] == "Tricky word":
-                            count += 1
-                            tricky_count += 1
-                        elif type_list[i] == "Exception-implicit":
-                            count += 1
-                            tricky_count += 1
+        # get the transcriptions for the dataframe depending on the greedy mode
+        transcriptions = decoder.decode_words(words, phoneme_dic, greedy)
+        decodable = {word: transcriptions[word] != {} for word in words}
+        transcription_sets = {word: set(ipa for key in transcriptions[word] for ipa in transcriptions[word][key])
+                              for word in words}
+        correct = {pair: pair[1] in transcription_sets[pair[0]] for pair in pairs}
     else:
-        for i in range(len(phonology)):
-            if phonology[i] not in seen:
-                seen.append(phonology[i])
-                if phonology[i] in transcriptions[orthography[i]]:
-                    count += 1
-                elif type_list[i] == "Tricky word":
-                    count += 1
-                    tricky_count += 1
-                elif type_list[i] == "Exception-implicit":
-                    count += 1
-                    tricky_count += 1
-    phonology = list(dict.fromkeys(phonology))  # to get rid of duplicates for percentage purposes
-    return (count / len(phonology)) * 100, tricky_count
+        # the exhaustive mode only needs to know if the coded phonology can be reached, so the transcriptions of the
+        # words are not enumerated
+        trie = decoder.build_grapheme_trie(phoneme_dic)
+        decodable = {word: decoder.is_decodable(word, phoneme_dic, trie) for word in words}
+        correct = {pair: decodable[pair[0]] and decoder.can_decode_to(pair[0], pair[1], phoneme_dic, trie)
+                   for pair in pairs}
+    records = score_words(orthography, phonology, df["Type"].tolist(), [decodable[word] for word in orthography],
+                          [correct[pair] for pair in zip(orthography, phonology)], greedy)
+
+    if distance is not None:
+        # only the words that were decoded, but not to their coded phonology, have a distance to measure
+        missed = [pair for pair in pairs if decodable[pair[0]] and not correct[pair]]
+        if greedy == 'small' or greedy == 'big':
+            candidates = [sorted(transcription_sets[pair[0]]) for pair in missed]
+            closest = dict(zip(missed, distance.closest_misses([pair[1] for pair in missed], candidates)))
+        else:
+            # the exhaustive mode can have too many transcriptions to enumerate, so the closest one is found over the
+            # segmentation lattice of the word
+            closest = {pair: distance.lattice_distance(pair[1], decoder.build_lattice(pair[0], trie), phoneme_dic)
+                       for pair in missed}
+        records["Closest miss"] = [closest.get(pair, 0.0) if decodable[pair[0]] else float("nan")
+                                   for pair in zip(orthography, phonology)]
+    return records
+
+
+def score_words(orthography: list[str], phonology: list[str], type_list: list[str], decodable: list[bool],
+                correct: list[bool], greedy: str) -> pandas.DataFrame:
+    """
+    This function scores the words of a vocabulary once it is known which of them the rules can decode. Each coded
+    phonology is only scored once, at its first occurrence. In the greedy modes, a tricky word that cannot be decoded
+    at all is counted as read correctly at every occurrence.
+    :param orthography: the lower case orthography of each word of the vocabulary
+    :param phonology: the coded phonology of each word of the vocabulary
+    :param type_list: the type of each word of the vocabulary, e.g., "Rule example word" or "Tricky word"
+    :param decodable: for each word, True if the rules give the word at least one IPA transcription
+    :param correct: for each word, True if its coded phonology is one of the IPA transcriptions of the word
+    :param greedy: described in the decode_words function in decoder.py module
+    :return: A Pandas DataFrame with one record for each word, containing its orthography, phonology and type, if it is
+    decodable and correct, if it was scored, if it was read correctly, and if it was only read correctly because it is
+    a tricky word
+    """
+    records = pd.DataFrame({"Orthography": orthography, "Phonology": phonology, "Type": type_list,
+                            "Decodable": decodable, "Correct": correct})
+    is_tricky = records["Type"].isin(TRICKY_TYPES)
+
+    # words that are not decodable in the greedy modes are only scored if they are tricky words
+    undecodable = (greedy == 'small' or greedy == 'big') & ~records["Decodable"]
+    first = ~undecodable & ~records["Phonology"].where(~undecodable).duplicated()
+    records["Scored"] = first | (undecodable & is_tricky)
+    records["Read"] = (first & (records["Correct"] | is_tricky)) | (undecodable & is_tricky)
+    records["Tricky"] = records["Read"] & ~(first & records["Correct"])
+    return records
+
+
+def get_accuracy(records: pandas.DataFrame) -> tuple[float, int]:
+    """
+    This function returns the accuracy of the rules on a vocabulary from the word records returned by <score_words>.
+    :param records: the records of the words of the vocabulary
+    :return: a tuple containing the percentage of correct words read, and the number of tricky words that could not
+    decoded with the dictionary rules but were included in the correct words read
+    """
+    unique_phonology = records["Phonology"].nunique()  # duplicates do not count for percentage purposes
+    return float(records["Read"].sum()) / unique_phonology * 100, int(records["Tricky"].sum())
+
+
+def get_closest_miss(records: pandas.DataFrame) -> float:
+    """
+    This function returns how close the rules came to the coded phonology of the words they decoded incorrectly, from
+    word records returned by <get_word_records> with a distance.
+    :param records: the records of the words of the vocabulary, with a "Closest miss" column
+    :return: the mean distance from the coded phonology of each scored word that was decoded incorrectly to its closest
+    transcription, or NaN if there are no such words
+    """
+    missed = records["Scored"] & records["Decodable"] & ~records["Correct"]
+    return float(records.loc[missed, "Closest miss"].mean())
+
+
+def get_frequency_index(corpus: str = "6k") -> dict[str, float]:
+    """
+    This function returns the word frequencies of a corpus. The index is built once and kept in memory, and it is only
+    built again if the corpus file has been modified since.
+    :param corpus: a corpus of <FREQUENCY_CORPORA>
+    :return: a dictionary with the lower case words of the corpus as keys and their frequencies as values. A word that
+    appears more than once keeps its first frequency.
+    """
+    file, column = FREQUENCY_CORPORA[corpus]
+    modified = os.path.getmtime(file)
+    if corpus not in _frequency_indexes or _frequency_indexes[corpus][0] != modified:
+        frequencies = {}
+        with open(file) as f:
+            for line in f:
+                row = line.split()
+                if row:
+                    frequencies.setdefault(row[0].lower(), float(row[column]))
+        _frequency_indexes[corpus] = (modified, frequencies)
+    return _frequency_indexes[corpus][1]
+
+
+def get_weighted_accuracy(records: pandas.DataFrame, frequencies: dict[str, float]) -> tuple[float, float, float]:
+    """
+    This function returns the accuracy of the rules on a vocabulary with every word weighted by its frequency, from the
+    word records returned by <score_words>. Only the scored words that have a frequency are weighted.
+    :param records: the records of the words of the vocabulary
+    :param frequencies: a dictionary with lower case words as keys and their frequencies as values
+    :return: a tuple containing the percentage of correct words read as returned by <get_accuracy>, the percentage of
+    correct words read when each word counts as much as its frequency, and the percentage of scored words that have a
+    frequency
+    """
+    weights = records["Orthography"].map(frequencies).where(records["Scored"])
+    known = weights.notna()
+    token_accuracy = float(weights[known & records["Read"]].sum() / weights[known].sum() * 100) if known.any() \
+        else float("nan")
+    return get_accuracy(records)[0], token_accuracy, float(known.sum()) / int(records["Scored"].sum()) * 100
+
+
+def get_weighted_transcription(df: pandas.DataFrame, phoneme_dic: dict[str, list[str]], greedy: str,
+                               corpus: str = "6k") -> tuple[float, float, float]:
+    """
+    This function returns the percentage of words correctly decoded from the dataframe, both with every word counted
+    once and with every word weighted by its frequency in a corpus.
+    :param df: A Pandas DataFrame with rows containing information about the month, phonology, orthography, et cetera of
+    a word.
+    :param phoneme_dic: a dictionary with graphemes as keys and phoneme correspondences as a list as respective values
+    :param greedy: described in the decode_words function in decoder.py module
+    :param corpus: the corpus of <FREQUENCY_CORPORA> to take the word frequencies from
+    :return: the tuple described in <get_weighted_accuracy>
+    """
+    return get_weighted_accuracy(get_word_records(df, phoneme_dic, greedy), get_frequency_index(corpus))
+
+
+def get_corpus_coverage(phoneme_dic: dict[str, list[str]], corpus: str = "6k") -> tuple[float, float]:
+    """
+    This function returns how much of a whole corpus the rules can decode. The phonology of the corpora is not coded in
+    IPA, so the words are only checked for being decodable, not for being correct.
+    :param phoneme_dic: a dictionary with graphemes as keys and phoneme correspondences as a list as respective values
+    :param corpus: a corpus of <FREQUENCY_CORPORA>
+    :return: a tuple containing the percentage of the words of the corpus that are decodable, and the percentage when
+    each word counts as much as its frequency
+    """
+    frequencies = get_frequency_index(corpus)
+    trie = decoder.build_grapheme_trie(phoneme_dic)  # built once for the whole corpus
+    decodable = [word for word in frequencies if decoder.is_decodable(word, phoneme_dic, trie)]
+    return len(decodable) / len(frequencies) * 100, \
+        sum(frequencies[word] for word in decodable) / sum(frequencies.values()) * 100
+
+
+def profile_decoding(df: pandas.DataFrame, phoneme_dic: dict[str, list[str]], greedy: str, out_file: str = None,
+                     top_n: int = 10) -> dict:
+    """
+    This function decodes every unique word of the dataframe with the rules taught in the dictionary, measuring each
+    word, and returns the report of the profile to find the words that make the decoding slow.
+    :param df: A Pandas DataFrame with rows containing information about the month, phonology, orthography, et cetera of
+    a word.
+    :param phoneme_dic: a dictionary with graphemes as keys and phoneme correspondences as a list as respective values
+    :param greedy: described in the decode_words function in decoder.py module
+    :param out_file: if passed, the report is also written to this JSON file
+    :param top_n: the number of slowest words in the report
+    :return: the report described in <report> of the DecodeProfile class in decode_profile.py
+    """
+    profile = decode_profile.DecodeProfile()
+    decoder.decode_words(list(dict.fromkeys(df["Orthography"].str.lower().str.strip())), phoneme_dic, greedy,
+                         profile=profile)
+    if out_file is not None:
+        profile.write(out_file, top_n)
+    return profile.report(top_n)
+
+
+def get_learning_curve(file: str, greedy: str) -> pandas.DataFrame:
+    """
+    This function returns the accuracy with which the rules taught in a curriculum can read its vocabulary at the end
+    of every week of the curriculum, i.e., the values <get_transcription> would give for the vocabulary and GPCs taught
+    up to each week. The coding sheet is read once and walked in the order of its Week and Order columns. A row taught
+    over a range of weeks, e.g., '17, 18' or '7, 8, 9, ..., 16', counts as taught in the first week of the range. Each
+    time a GPC is taught, only the words that contain its grapheme are decoded again, as the transcriptions of the other
+    words cannot change.
+    :param file: A CSV file that contains information from the coded curriculum
+    :param greedy: described in the decode_words function in decoder.py module
+    :return: A Pandas DataFrame with one row for each week in which some vocabulary has been taught, in the order of the
+    weeks, containing the week number, the number of graphemes and words taught up to that week, the percentage of
+    correct words read and the number of tricky words counted as correct
+    """
+    df = pd.read_csv(file, na_filter=False)
+    df["Week"] = df["Week"].astype(str).str.split(",").str[0].str.strip().astype(int)  # the first week of a range
+    df = df.sort_values(["Week", "Order"], kind="stable")
+    df = df[["Week", "Type", "Lexicality", "Orthography", "Phonology"]]
+    df = df.drop(df[(df.Lexicality == 'Word sentence')].index)
+    df = df.drop(df[(df.Lexicality == 'Word Sentence')].index)
+    df = df.drop(df[(df.Lexicality == 'Word phrase')].index)
+
+    gpc_dic = {}  # the rules taught so far
+    orthography = []  # the vocabulary taught so far
+    phonology = []
+    type_list = []
+    phonologies = {}  # the coded phonologies of each word in the vocabulary
+    decodable = {}  # if a word in the vocabulary can be decoded with the rules taught so far
+    correct = {}  # if a (word, phonology) pair in the vocabulary can be decoded with the rules taught so far
+    curve = []
+
+    def decode(words: list[str]) -> None:
+        # decode <words> again with the rules taught so far and update their results
+        if greedy == 'small' or greedy == 'big':
+            transcriptions = decoder.decode_words(words, gpc_dic, greedy)
+            for word in words:
+                decodable[word] = transcriptions[word] != {}
+                for phon in phonologies[word]:
+                    correct[(word, phon)] = any(phon in value for value in transcriptions[word].values())
+        else:
+            trie = decoder.build_grapheme_trie(gpc_dic)
+            for word in words:
+                decodable[word] = decoder.is_decodable(word, gpc_dic, trie)
+                for phon in phonologies[word]:
+                    correct[(word, phon)] = correct[(word, phon)] or \
+                        (decodable[word] and decoder.can_decode_to(word, phon, gpc_dic, trie))
+
+    def add_point(week: int) -> None:
+        # add the accuracy at the end of <week> to the curve
+        if phonology != []:
+            records = score_words(orthography, phonology, type_list, [decodable[word] for word in orthography],
+                                  [correct[(orthography[i], phonology[i])] for i in range(len(phonology))], greedy)
+            accuracy = get_accuracy(records)
+            curve.append([week, len(gpc_dic), len(dict.fromkeys(phonology)), accuracy[0], accuracy[1]])
+
+    week = None
+    for row in df.itertuples(index=False):
+        if week is not None and row.Week != week:
+            add_point(week)
+        week = row.Week
+        if row.Lexicality != 'Word':  # the row teaches a GPC
+            grapheme = row.Orthography.replace(' ', '')
+            gpc_dic.setdefault(grapheme, []).append(row.Phonology.strip())
+
+            # only the words containing the grapheme can get new transcriptions. In the exhaustive mode, the words
+            # that can already be decoded into all their phonologies stay correct when a rule is added
+            if greedy == 'small' or greedy == 'big':
+                affected = [word for word in phonologies if grapheme in word]
+            else:
+                affected = [word for word in phonologies if grapheme in word and
+                            not all(correct[(word, phon)] for phon in phonologies[word])]
+            decode(affected)
+        elif "/" not in row.Phonology:  # the row is a word of the vocabulary with a single phonology
+            word = row.Orthography.lower().strip()
+            orthography.append(word)
+            phonology.append(row.Phonology.strip())
+            type_list.append(row.Type)
+            if (word, phonology[-1]) not in correct:
+                phonologies.setdefault(word, []).append(phonology[-1])
+                correct[(word, phonology[-1])] = False
+                decode([word])
+    if week is not None:
+        add_point(week)
+    return pd.DataFrame(curve, columns=["Week", "GPCs", "Words", "Accuracy", "Tricky count"])
 
 
 if __name__ == "__main__":
@@ -168,3 +418,16 @@ if __name__ == "__main__":
 
     # uncomment the following line to see the output. Specify greedy mode.
     # print(get_transcription(curricula, rules_dic, 'no'))
+
+    # uncomment the following line to also see how close the incorrect transcriptions came to the coded phonology. Run
+    # confusion_matrix.py in the phoneme_confusability directory first to produce the confusability values.
+    # print(get_transcription(curricula, rules_dic, 'no', phoneme_distance.load_distance()))
+
+    # uncomment the following line to also see the accuracy with every word weighted by its frequency in the HS04 corpus
+    # print(get_weighted_transcription(curricula, rules_dic, 'no', "6k"))
+
+    # uncomment the following line to write the time and work of decoding each word, with the slowest words, to a file
+    # profile_decoding(curricula, rules_dic, 'no', "decode_profile.json")
+
+    # uncomment the following line to see the accuracy at the end of every week of a curriculum. Specify greedy mode.
+    # print(get_learning_curve("Letters and Sounds Curriculum Coding Sheet - Coder 1.csv", 'no'))
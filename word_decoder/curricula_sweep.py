@@ -0,0 +1,96 @@
+"""
+This module runs the accuracy analysis of curricula_analysis.py over the whole grid of analysis parameters: curriculum
+(Jolly Phonics or Letters and Sounds) x month x greedy mode x whether implicitly taught GPCs are used. The cells of the
+grid are spread across a pool of processes. The coding sheets and the phoneme dictionary are parsed once, and the
+parsed vocabularies and GPC dictionaries are sent to each worker process once when it starts, rather than with every
+cell.
+
+The result is a single table with one row for each cell of the grid.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+import pandas
+import pandas as pd
+
+import curricula_analysis
+import decoder
+
+PHONEME_FILE = "phoneme dictionary.xlsx - Sheet1.csv"
+CURRICULA = {"JP": ("Jolly Phonics Curriculum Coding Sheet - Coder 1.csv", decoder.JP),
+             "LS": ("Letters and Sounds Curriculum Coding Sheet - Coder 1.csv", decoder.LS)}
+MONTHS = [1, 2, 3]  # any month other than 1 or 2 gives the vocabulary of all the months
+GREEDY_MODES = ['no', 'small', 'big']
+IMPLICIT = [False, True]
+
+_shared = {}  # the vocabularies and GPC dictionaries of a worker process, set by <_init_worker>
+
+
+def _init_worker(vocabularies: dict, gpcs: dict) -> None:
+    """
+    This function is run once in every worker process of the sweep and stores the parsed data that the cells use.
+    :param vocabularies: a dictionary with (curriculum, month) tuples as keys and vocabulary DataFrames as values
+    :param gpcs: a dictionary with (curriculum, implicit) tuples as keys and GPC dictionaries as values
+    :return: None
+    """
+    _shared["vocabularies"] = vocabularies
+    _shared["gpcs"] = gpcs
+
+
+def _run_cell(cell: tuple[str, int, str, bool]) -> list:
+    """
+    This function computes the accuracy for one cell of the grid in a worker process.
+    :param cell: a tuple of (curriculum, month, greedy mode, implicit)
+    :return: a row of the results table
+    """
+    curriculum, month, greedy, implicit = cell
+    accuracy, tricky_count = curricula_analysis.get_transcription(_shared["vocabularies"][(curriculum, month)],
+                                                                  _shared["gpcs"][(curriculum, implicit)], greedy)
+    return [curriculum, month, greedy, implicit, accuracy, tricky_count]
+
+
+def sweep(curricula: list[str] = None, months: list[int] = None, greedy_modes: list[str] = None,
+          implicit: list[bool] = None, processes: int = None) -> pandas.DataFrame:
+    """
+    This function computes the accuracy of <get_transcription> in curricula_analysis.py for every combination of the
+    given parameters across a pool of processes. The rules of each cell are the GPCs of the curriculum in the phoneme
+    dictionary, with or without the implicitly taught GPCs, and the vocabulary is the vocabulary of the curriculum up
+    to the month of the cell.
+    :param curricula: the curricula to analyse, from the keys of <CURRICULA>. All curricula are used if not passed.
+    :param months: the months to analyse, as described in get_curricula_vocabulary. All months are used if not passed.
+    :param greedy_modes: the greedy modes to analyse. All modes are used if not passed.
+    :param implicit: whether to use the implicitly taught GPCs. Both are used if not passed.
+    :param processes: the number of worker processes. All the cores of the machine are used if not passed.
+    :return: A Pandas DataFrame with one row for each cell, containing the parameters of the cell, the percentage of
+    correct words read and the number of tricky words counted as correct. It has no rows if any of the parameters is
+    an empty list.
+    """
+    curricula = list(CURRICULA) if curricula is None else curricula
+    months = MONTHS if months is None else months
+    greedy_modes = GREEDY_MODES if greedy_modes is None else greedy_modes
+    implicit = IMPLICIT if implicit is None else implicit
+
+    # parse every file once in the main process
+    vocabularies = {(curriculum, month): curricula_analysis.get_curricula_vocabulary(CURRICULA[curriculum][0], month)
+                    for curriculum in curricula for month in months}
+    rules = decoder.GPCRuleSet(PHONEME_FILE)
+    gpcs = {(curriculum, alternative_implicit): rules.curriculum(CURRICULA[curriculum][1], alternative_implicit)
+            for curriculum in curricula for alternative_implicit in implicit}
+
+    cells = list(product(curricula, months, greedy_modes, implicit))
+    processes = os.cpu_count() if processes is None else processes
+    rows = []
+    if cells:  # a pool cannot be made without workers
+        with ProcessPoolExecutor(max_workers=min(processes, len(cells)), initializer=_init_worker,
+                                 initargs=(vocabularies, gpcs)) as executor:
+            rows = list(executor.map(_run_cell, cells))
+    return pd.DataFrame(rows, columns=["Curriculum", "Month", "Greedy", "Implicit", "Accuracy", "Tricky count"])
+
+
+if __name__ == "__main__":
+    results = sweep()
+
+    # uncomment the following line to see the output
+    # print(results.to_string())
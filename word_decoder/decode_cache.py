@@ -0,0 +1,95 @@
+"""
+This module keeps a persistent on-disk cache of the transcriptions produced by decoder.py, so that repeated analysis
+runs over the same vocabularies only decode the words, greedy modes and sets of GPCs they have not seen before.
+
+The cache is a SQLite database with one row for each (word, greedy mode, GPC fingerprint) key, where the fingerprint
+is a hash of the phoneme dictionary used to decode the word. The transcriptions are stored as JSON. Every lookup
+updates the time at which a row was last used, and the least recently used rows are removed once the cache holds more
+than a given number of rows.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import Union
+
+import decoder
+
+CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "decode_cache.sqlite")
+MAX_ENTRIES = 500000  # maximum number of rows kept in the cache before the least recently used ones are removed
+
+
+def gpc_fingerprint(phoneme_dict: dict[str, list[str]]) -> str:
+    """
+    This function returns a hash of a phoneme dictionary and of the version of the decoder. Two dictionaries have the
+    same fingerprint only if they contain the same graphemes with the same phoneme correspondences in the same order,
+    and the rows cached by an older version of the decoder are never found again.
+    :param phoneme_dict: a dictionary containing grapheme-phoneme correspondences
+    :return: a hexadecimal string that identifies the dictionary
+    """
+    encoded = json.dumps([decoder.DECODER_VERSION, sorted(phoneme_dict.items())], ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def open_cache(cache_file: str = CACHE_FILE) -> sqlite3.Connection:
+    """
+    This function opens the cache database, creating it if it does not exist yet.
+    :param cache_file: the path of the SQLite file that stores the cache
+    :return: a connection to the cache database
+    """
+    connection = sqlite3.connect(cache_file)
+    connection.execute("CREATE TABLE IF NOT EXISTS decodes (word TEXT NOT NULL, greedy TEXT NOT NULL, "
+                       "fingerprint TEXT NOT NULL, result TEXT NOT NULL, last_used REAL NOT NULL, "
+                       "PRIMARY KEY (word, greedy, fingerprint)) WITHOUT ROWID")
+    connection.execute("CREATE INDEX IF NOT EXISTS decodes_last_used ON decodes (last_used)")
+    return connection
+
+
+def cached_decode_words(words: list[str], phoneme_dict: dict[str, list[str]], greedy: str,
+                        cache_file: str = CACHE_FILE, max_entries: int = MAX_ENTRIES) -> \
+        Union[dict[str, list[str]], dict[str, dict[int, list[str]]]]:
+    """
+    This function decodes a list of words in the same way as <decode_words> in decoder.py, but only decodes the words
+    that are not in the cache for this greedy mode and phoneme dictionary yet. The new transcriptions are added to the
+    cache and the least recently used rows are removed if the cache grows beyond <max_entries> rows.
+    :param words: List of words to be decoded into IPA
+    :param phoneme_dict: a dictionary containing grapheme-phoneme correspondences
+    :param greedy: described in the decode_words function in decoder.py module
+    :param cache_file: the path of the SQLite file that stores the cache
+    :param max_entries: the maximum number of rows kept in the cache
+    :return: the same dictionary that <decode_words> returns for these words
+    """
+    fingerprint = gpc_fingerprint(phoneme_dict)
+    keys = list(dict.fromkeys(word.lower().strip() for word in words))  # the words as decode_words stores them
+    now = time.time()
+    results = {}
+    with closing(open_cache(cache_file)) as connection, connection:
+        for word in keys:
+            row = connection.execute("SELECT result FROM decodes WHERE word = ? AND greedy = ? AND fingerprint = ?",
+                                     (word, greedy, fingerprint)).fetchone()
+            if row is not None:
+                results[word] = json.loads(row[0])
+        connection.executemany("UPDATE decodes SET last_used = ? WHERE word = ? AND greedy = ? AND fingerprint = ?",
+                               [(now, word, greedy, fingerprint) for word in results])
+
+        # decode only the words that were not in the cache
+        missing = [word for word in keys if word not in results]
+        decoded = decoder.decode_words(missing, phoneme_dict, greedy)
+        connection.executemany("INSERT OR REPLACE INTO decodes VALUES (?, ?, ?, ?, ?)",
+                               [(word, greedy, fingerprint, json.dumps(decoded[word], ensure_ascii=False), now)
+                                for word in decoded])
+        results.update(decoded)
+
+        # remove the least recently used rows if the cache is over its size
+        size = connection.execute("SELECT COUNT(*) FROM decodes").fetchone()[0]
+        if size > max_entries:
+            connection.execute("DELETE FROM decodes WHERE (word, greedy, fingerprint) IN (SELECT word, greedy, "
+                               "fingerprint FROM decodes ORDER BY last_used LIMIT ?)", (size - max_entries,))
+
+    # JSON stores the number of recursions of the greedy modes as strings
+    if greedy == 'small' or greedy == 'big':
+        results = {word: {int(key): value for key, value in results[word].items()} for word in results}
+    return {word: results[word] for word in keys}
@@ -0,0 +1,202 @@
+"""
+This module is a command line entry point to decoder.py. It reads words from a file or from the standard input and
+writes one JSON line for each word, containing its transcriptions, the number of ways it can be decoded with each
+number of GPCs, and whether it can be decoded at all.
+
+The words flow through a pipeline of generators a chunk at a time, and at most a few chunks are decoded at once, so
+the memory used stays the same however many words are read. This makes it possible to pipe whole frequency lists
+through the decoder, e.g.:
+
+    cut -f1 frequency_list.txt | python decode_cli.py --greedy big > transcriptions.jsonl
+
+Only the first field of each line is read as the word, so files with a word and its frequency on each line can be
+used directly. Empty lines are skipped.
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Iterable, Iterator
+
+import decoder
+
+PHONEME_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "phoneme dictionary.xlsx - Sheet1.csv")
+CURRICULA = {"JP": decoder.JP, "LS": decoder.LS}
+CHUNK_SIZE = 256  # number of words decoded together
+CHUNKS_PER_PROCESS = 2  # chunks waiting or being decoded for each worker process at any time
+ORDERS = ["input", "completed"]
+
+_shared = {}  # the phoneme dictionary, trie, greedy mode and transcription limit of a worker process
+
+
+def read_words(lines: Iterable[str]) -> Iterator[str]:
+    """
+    This function yields the word on each line of a file.
+    :param lines: the lines of a file, e.g., an open file or sys.stdin
+    :return: a generator of the first field of every line that is not empty
+    """
+    for line in lines:
+        fields = line.split()
+        if fields:
+            yield fields[0]
+
+
+def chunked(words: Iterable[str], chunk_size: int) -> Iterator[list[str]]:
+    """
+    This function groups words into chunks.
+    :param words: the words to group
+    :param chunk_size: the number of words in each chunk. The last chunk can be smaller.
+    :return: a generator of lists of words
+    """
+    words = iter(words)
+    chunk = list(islice(words, chunk_size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(words, chunk_size))
+
+
+def decode_record(word: str, phoneme_dict: dict[str, list[str]], greedy: str, trie: dict,
+                  max_transcriptions: int = None) -> dict:
+    """
+    This function decodes a word and returns everything the command line writes about it.
+    :param word: the word to be decoded
+    :param phoneme_dict: a dictionary containing grapheme-phoneme correspondences
+    :param greedy: described in the decode_words function in decoder.py module
+    :param trie: a trie of the graphemes in <phoneme_dict> built by <build_grapheme_trie> in decoder.py
+    :param max_transcriptions: if passed, at most this many transcriptions are written in the 'no' mode. They are
+    enumerated lazily, so the other transcriptions of a very ambiguous word are never made.
+    :return: a dictionary with the word, its transcriptions as returned by <decode_words>, its segment counts as
+    returned by <segment_counts> and whether it is decodable
+    """
+    counts = decoder.segment_counts(word, phoneme_dict, trie)
+    if greedy == 'no' and max_transcriptions is not None:
+        transcriptions = list(islice(decoder.iter_transcriptions(word, phoneme_dict, trie), max_transcriptions))
+    else:
+        transcriptions = next(iter(decoder.decode_words([word], phoneme_dict, greedy, trie).values()))
+    return {"word": word, "transcriptions": transcriptions, "segment_counts": counts, "decodable": counts != {}}
+
+
+def decode_chunk(chunk: list[str], phoneme_dict: dict[str, list[str]], greedy: str, trie: dict,
+                 max_transcriptions: int = None) -> list[str]:
+    """
+    This function decodes a chunk of words into JSON lines.
+    :param chunk: a list of words
+    :param phoneme_dict: a dictionary containing grapheme-phoneme correspondences
+    :param greedy: described in the decode_words function in decoder.py module
+    :param trie: a trie of the graphemes in <phoneme_dict> built by <build_grapheme_trie> in decoder.py
+    :param max_transcriptions: described in <decode_record>
+    :return: the JSON line of each word of the chunk, in the order of the chunk
+    """
+    return [json.dumps(decode_record(word, phoneme_dict, greedy, trie, max_transcriptions), ensure_ascii=False)
+            for word in chunk]
+
+
+def _init_worker(phoneme_dict: dict[str, list[str]], trie: dict, greedy: str, max_transcriptions: int) -> None:
+    """
+    This function is run once in every worker process and stores the data that every chunk is decoded with.
+    :param phoneme_dict: a dictionary containing grapheme-phoneme correspondences
+    :param trie: a trie of the graphemes in <phoneme_dict>
+    :param greedy: described in the decode_words function in decoder.py module
+    :param max_transcriptions: described in <decode_record>
+    :return: None
+    """
+    _shared["arguments"] = (phoneme_dict, greedy, trie, max_transcriptions)
+
+
+def _decode_chunk(chunk: list[str]) -> list[str]:
+    """
+    This function decodes a chunk of words into JSON lines in a worker process.
+    :param chunk: a list of words
+    :return: the JSON line of each word of the chunk, in the order of the chunk
+    """
+    return decode_chunk(chunk, *_shared["arguments"])
+
+
+def decode_stream(words: Iterable[str], phoneme_dict: dict[str, list[str]], greedy: str, processes: int = 1,
+                  chunk_size: int = CHUNK_SIZE, order: str = "input", max_transcriptions: int = None) -> Iterator[str]:
+    """
+    This function lazily decodes a stream of words into JSON lines. Only <CHUNKS_PER_PROCESS> chunks for each worker
+    process are read ahead of the lines that have been yielded.
+    :param words: the words to decode, e.g., from <read_words>
+    :param phoneme_dict: a dictionary containing grapheme-phoneme correspondences
+    :param greedy: described in the decode_words function in decoder.py module
+    :param processes: the number of worker processes. The words are decoded in this process if it is 1.
+    :param chunk_size: the number of words decoded together
+    :param order: "input" to yield the lines in the order of the words, or "completed" to yield the lines of each chunk
+    as soon as it is decoded, so a chunk of slow words does not hold back the chunks after it
+    :param max_transcriptions: described in <decode_record>
+    :return: a generator of the JSON line of each word
+    """
+    trie = decoder.build_grapheme_trie(phoneme_dict)
+    if processes <= 1:
+        for chunk in chunked(words, chunk_size):
+            yield from decode_chunk(chunk, phoneme_dict, greedy, trie, max_transcriptions)
+        return
+
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                             initargs=(phoneme_dict, trie, greedy, max_transcriptions)) as executor:
+        pending = deque()
+        for chunk in chunked(words, chunk_size):
+            pending.append(executor.submit(_decode_chunk, chunk))
+            if len(pending) >= processes * CHUNKS_PER_PROCESS:
+                if order == "input":
+                    yield from pending.popleft().result()
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        pending.remove(future)
+                        yield from future.result()
+        if order == "input":
+            for future in pending:
+                yield from future.result()
+        else:
+            for future in wait(pending).done:
+                yield from future.result()
+
+
+def main(argv: list[str] = None) -> None:
+    """
+    This function runs the command line.
+    :param argv: the command line arguments. sys.argv is used if not passed.
+    :return: None
+    """
+    parser = argparse.ArgumentParser(description="Decode words into IPA transcriptions, one JSON line per word.")
+    parser.add_argument("input", nargs="?", default="-",
+                        help="file with one word per line, or - for the standard input")
+    parser.add_argument("--output", default="-", help="file to write the JSON lines to, or - for the standard output")
+    parser.add_argument("--greedy", choices=['no', 'small', 'big'], default='no', help="greedy mode of the decoder")
+    parser.add_argument("--phonemes", default=PHONEME_FILE, help="CSV file of GPCs, as described in decoder.py")
+    parser.add_argument("--curriculum", choices=list(CURRICULA), help="only use the GPCs taught in this curriculum")
+    parser.add_argument("--implicit", action="store_true", help="also use the GPCs taught implicitly in the curriculum")
+    parser.add_argument("--processes", type=int, default=1, help="number of worker processes")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="number of words decoded together")
+    parser.add_argument("--order", choices=ORDERS, default="input", help="order of the output lines")
+    parser.add_argument("--max-transcriptions", type=int,
+                        help="write at most this many transcriptions of each word in the 'no' mode")
+    arguments = parser.parse_args(argv)
+
+    rules = decoder.GPCRuleSet(arguments.phonemes)
+    if arguments.curriculum is None:
+        phoneme_dict = rules.all_gpcs()
+    else:
+        phoneme_dict = rules.curriculum(CURRICULA[arguments.curriculum], arguments.implicit)
+
+    source = sys.stdin if arguments.input == "-" else open(arguments.input, encoding="utf-8")
+    target = sys.stdout if arguments.output == "-" else open(arguments.output, "w", encoding="utf-8")
+    try:
+        for line in decode_stream(read_words(source), phoneme_dict, arguments.greedy, arguments.processes,
+                                  arguments.chunk_size, arguments.order, arguments.max_transcriptions):
+            target.write(line + "\n")
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+This module collects the measurements that decoder.py records for every word it decodes when it is given a
+DecodeProfile, and summarises them to find the words that make a decoding run slow.
+
+For each word, the profile holds:
+- seconds: the time taken to build the lattice of the word and decode it
+- offsets: the number of offsets of the segmentation lattice that were solved
+- substrings: the number of candidate graphemes matched at those offsets
+- combinations: the number of phoneme and suffix transcription pairs joined, i.e., the work of the dynamic programming
+- peak: the largest number of transcriptions from one offset of the lattice, counting every way of splitting the word
+- transcriptions: the number of transcriptions returned for the word
+
+Profiling is opt-in: decode_words only measures anything when a profile is passed to it.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+FIELDS = ["seconds", "offsets", "substrings", "combinations", "peak", "transcriptions"]
+
+
+class DecodeProfile:
+    """
+    The measurements of every word decoded with this profile.
+
+    === Attributes ===
+    records: a dictionary with the words as keys and dictionaries of their measurements, keyed by the names in
+    <FIELDS>, as values. A word that is decoded again, e.g., in another greedy mode, keeps its last measurements.
+    """
+    records: dict[str, dict[str, float]]
+
+    def __init__(self) -> None:
+        """
+        Make an empty profile.
+        """
+        self.records = {}
+
+    def add(self, word: str, seconds: float, stats: dict[str, int]) -> None:
+        """
+        Record the measurements of a word.
+        :param word: the word that was decoded
+        :param seconds: the time taken to decode the word
+        :param stats: the counts filled in by <get_transcriptions> in decoder.py, with the number of transcriptions
+        :return: None
+        """
+        self.records[word] = dict(stats, seconds=seconds)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Return the measurements as a table.
+        :return: a DataFrame with a "Word" column and a column for each of <FIELDS>, with one row for each word
+        """
+        return pd.DataFrame([[word] + [record[field] for field in FIELDS] for word, record in self.records.items()],
+                            columns=["Word"] + FIELDS)
+
+    def slowest(self, n: int = 10) -> list[tuple[str, dict[str, float]]]:
+        """
+        Return the words that took the longest to decode.
+        :param n: the number of words to return
+        :return: a list of (word, measurements) tuples, from the slowest word
+        """
+        return sorted(self.records.items(), key=lambda item: item[1]["seconds"], reverse=True)[:n]
+
+    def histogram(self, field: str, bins: int = 10, log: bool = True) -> tuple[list[int], list[float]]:
+        """
+        Return the histogram of a measurement over the words.
+        :param field: a name of <FIELDS>
+        :param bins: the number of bins
+        :param log: if true, the bins are spaced evenly on a log scale, as the work of a word grows exponentially with
+        its number of graphemes. Values of 0 are counted in the first bin. Linear bins are used if the values do not
+        span a range above 0.
+        :return: a tuple containing the number of words in each bin and the edges of the bins
+        """
+        values = np.array([record[field] for record in self.records.values()], dtype=float)
+        if len(values) == 0:
+            return [0] * bins, [0.0] * (bins + 1)
+        positive = values[values > 0]
+        if log and len(positive) and positive.max() > positive.min():
+            edges = np.geomspace(positive.min(), positive.max(), bins + 1)
+            counts, edges = np.histogram(np.clip(values, positive.min(), None), bins=edges)
+        else:
+            counts, edges = np.histogram(values, bins=bins)
+        return counts.tolist(), edges.tolist()
+
+    def report(self, top_n: int = 10, bins: int = 10) -> dict:
+        """
+        Return a summary of the profile.
+        :param top_n: the number of slowest words to include
+        :param bins: the number of bins of each histogram
+        :return: a dictionary with the number of words, the total of each measurement, the <top_n> slowest words, and
+        the histogram of each measurement as returned by <histogram>
+        """
+        return {"words": len(self.records),
+                "totals": {field: float(sum(record[field] for record in self.records.values())) for field in FIELDS},
+                "slowest": [dict(record, word=word) for word, record in self.slowest(top_n)],
+                "histograms": {field: dict(zip(["counts", "edges"], self.histogram(field, bins))) for field in FIELDS}}
+
+    def write(self, out_file: str, top_n: int = 10, bins: int = 10) -> None:
+        """
+        Write the report of the profile to a JSON file.
+        :param out_file: the JSON file to write
+        :param top_n: described in <report>
+        :param bins: described in <report>
+        :return: None
+        """
+        with open(out_file, "w", encoding="utf-8") as f:
+            json.dump(self.report(top_n, bins), f, ensure_ascii=False, indent=2)
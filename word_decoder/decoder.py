@@ -27,10 +27,14 @@ user can also additional curriculum-specific columns after these columns if they
 The global variables might need to be changed or declared according to the user's needs.
 """
 
-from typing import Union
+import time
+import warnings
+from typing import Iterator, Union
 
 JP = 5  # column position of jolly phonics GPCs in the CSV file
 LS = 6  # column position of jolly phonics GPCs in the CSV file
+DECODER_VERSION = 2  # increase whenever the transcriptions returned by decode_words, or their order, change
+GRAPHEME_END = ''  # key that marks the end of a grapheme in a trie node, as no letter can be an empty string
 
 
 def read_orthography(file: str) -> dict[str, list[str]]:
@@ -39,62 +43,99 @@ def read_orthography(file: str) -> dict[str, list[str]]:
     :param file: A CSV file that contains information about graphemes and their corresponding phonemes
     :return: A dictionary that contains the graphemes as the keys and a list of corresponding phonemes as the values
     """
-    with open(file) as f:
-        f.readline()  # skip the first line, as it only contains headers
-        line = f.readline()
-        phoneme_dic = {}
-        while line != '':
-            if line.split(',')[0] not in phoneme_dic:
-                phoneme_dic[line.split(',')[0]] = [line.split(',')[1]]
-            else:
-                phoneme_dic[line.split(',')[0]].append(line.split(',')[1])
-            line = f.readline()
-        return phoneme_dic
+    return GPCRuleSet(file).all_gpcs()
+
+
+def build_grapheme_trie(phoneme_dict: dict[str, list[str]]) -> dict:
+    """
+    This function builds a prefix trie of all the graphemes in the dictionary. Each node of the trie is a dictionary
+    that maps a letter to the next node, and a node at which a grapheme ends stores that grapheme under the key
+    <GRAPHEME_END>. The trie only needs to be built once for a dictionary and can then be used to find every grapheme
+    of a word in a single scan.
+    :param phoneme_dict: a dictionary containing grapheme-phoneme correspondences
+    :return: the root node of the trie
+    """
+    trie = {}
+    for grapheme in phoneme_dict:
+        if grapheme == '':  # an empty grapheme cannot be matched against a word
+            continue
+        node = trie
+        for letter in grapheme:
+            node = node.setdefault(letter, {})
+        node[GRAPHEME_END] = grapheme
+    return trie
+
+
+def find_graphemes(word: str, trie: dict) -> list[list[str]]:
+    """
+    This function scans a word once and returns all the graphemes in the trie that start at each position of the word.
+    The scan walks down the trie from every position, so it takes O(n * k) steps for a word of length n, where k is
+    the length of the longest grapheme in the trie.
+    :param word: the word whose graphemes need to be found
+    :param trie: a trie built by <build_grapheme_trie>
+    :return: a list with one entry for each position of the word, where each entry is the list of graphemes that
+    start at that position, ordered from the shortest to the longest
+    """
+    matches = []
+    for i in range(len(word)):
+        node = trie
+        found = []
+        j = i
+        while j < len(word) and word[j] in node:
+            node = node[word[j]]
+            j += 1
+            if GRAPHEME_END in node:
+                found.append(node[GRAPHEME_END])
+        matches.append(found)
+    return matches
 
 
 def get_substrings(word: str, phoneme_dict: dict[str, list[str]]) -> list[str]:
     """
-    This is a helper function for the recursive decoding method. This function returns a list of all substrings of a
-    string such that the substrings do not contain the first letter of the string. Moreover, these substrings also have
-    phoneme correspondences in the dictionary <phoneme_dict>.
+    This function returns all the substrings of a word that do not contain its first letter and have phoneme
+    correspondences in the dictionary.
+    Deprecated: the decoder no longer uses it. Use <find_graphemes> to get the graphemes at every position of a word.
     :param word: the word whose substrings need to be generated
     :param phoneme_dict: a dictionary containing grapheme-phoneme correspondences
-    :return: a list of all substrings of the string, excluding those substrings that contain the first letter of the
-    string such that these substrings have a phoneme correspondence in the dictionary
-    """
-    res = [word[i: j] for i in range(1, len(word))  # get all substrings except first letter substrings
-           for j in range(i + 1, len(word) + 1)]
-    res_cpy = []
-
-    # append only those items to the list that have phoneme correspondences
-    while res != []:
-        for item in res:
-            if item not in phoneme_dict:
-                res.remove(item)
-            else:
-                res_cpy.append(item)
-                res.remove(item)
-    return res_cpy
+    :return: a list of the substrings, ordered by the position they start at and then from the shortest to the longest.
+    A grapheme that appears at more than one position is repeated.
+    """
+    warnings.warn("get_substrings is deprecated, use find_graphemes instead", DeprecationWarning, stacklevel=2)
+    return [grapheme for found in find_graphemes(word, build_grapheme_trie(phoneme_dict))[1:] for grapheme in found]
 
 
 def get_first_substring(word: str, phoneme_dict: dict[str, list[str]]) -> list[str]:
     """
-    This is a helper function for the recursive decoding function. It returns all substrings of the the word such that
-    they have a corresponding IPA transcription and contain the first letter of the string.
+    This function returns all the substrings of a word that contain its first letter and have phoneme correspondences
+    in the dictionary.
+    Deprecated: the decoder no longer uses it. Use <find_graphemes> to get the graphemes at every position of a word.
     :param word: the word whose substrings are to be returned
     :param phoneme_dict: a dictionary containing grapheme-phoneme correspondences
-    :return: a list of all substrings of the string, such that those substrings contain the first letter of the string
-    and these substrings have a phoneme correspondence in the dictionary
+    :return: a list of the substrings, ordered from the shortest to the longest
     """
-    first_letter_strings = []
-    for i in range(len(word)):
-        if word[:i + 1] in phoneme_dict:
-            first_letter_strings.append(word[:i + 1])  # list with first letter substrings with ipa transcription
-    return first_letter_strings
+    warnings.warn("get_first_substring is deprecated, use find_graphemes instead", DeprecationWarning, stacklevel=2)
+    found = find_graphemes(word, build_grapheme_trie(phoneme_dict))
+    return found[0] if found else []
 
 
-def decode_words(words: list[str], phoneme_dict: dict[str, list[str]], greedy: str) -> \
-        Union[dict[str, list[str]], dict[str, dict[int, list[str]]]]:
+def build_lattice(word: str, trie: dict) -> list[list[tuple[int, str]]]:
+    """
+    This function builds the segmentation lattice of a word. The lattice is a directed acyclic graph over the character
+    offsets 0 to len(word) of the word, with one edge for each grapheme in the trie that matches the word at a position.
+    Every path from offset 0 to offset len(word) is one way of splitting the word into graphemes.
+    :param word: the word whose lattice needs to be built
+    :param trie: a trie built by <build_grapheme_trie>
+    :return: a list with one entry for each offset of the word, where each entry is a list of (end offset, grapheme)
+    tuples for the edges leaving that offset
+    """
+    lattice = []
+    for i, position in enumerate(find_graphemes(word, trie)):
+        lattice.append([(i + len(grapheme), grapheme) for grapheme in position])
+    return lattice
+
+
+def decode_words(words: list[str], phoneme_dict: dict[str, list[str]], greedy: str, trie: dict = None,
+                 profile=None) -> Union[dict[str, list[str]], dict[str, dict[int, list[str]]]]:
     """
     This function takes a list of target words and decodes them into all possible IPA transcriptions depending on the
     greedy mode chosen.
@@ -104,109 +145,278 @@ def decode_words(words: list[str], phoneme_dict: dict[str, list[str]], greedy: s
     transcriptions is returned. If 'big' is chosen, only those transcriptions that required the minimum recursions is
     returned (the logic follows from mapping the largest graphemes first). If 'small' is chosen, only those
     transcriptions that required the maximum recursions is returned (the logic follows from mapping the smallest
-    graphemes first).
+    graphemes first). The number of recursions is the number of GPCs the word was split into.
+    :param trie: a trie of the graphemes in <phoneme_dict> built by <build_grapheme_trie>. It is built from
+    <phoneme_dict> if it is not passed.
+    :param profile: a DecodeProfile of decode_profile.py. If it is passed, the time and the work of decoding each word
+    are recorded in it. Nothing is measured if it is not passed.
     :return: If greedy modes 'small' or 'big' are chosen, a dictionary containing target words as keys and a dictionary
     as values containing the number of recursions made for those words as keys and list of transcriptions as values is
     returned. If 'no' is chosen, a dictionary containing target words as keys and a list of transcriptions as values is
-    chosen.
+    chosen. Every list of transcriptions is sorted, and the numbers of recursions are in increasing order.
     """
     decoder = {}
+    if trie is None:
+        trie = build_grapheme_trie(phoneme_dict)  # built once so that each word is scanned only once
+    alphabet = PhonemeAlphabet(phoneme_dict)  # the phonemes are interned once for all the words
     for word in words:
         word = word.lower()
         word = word.strip()
-
-        # if no grapheme-phoneme correspondences exist
-        if len(word) < 1 and greedy == 'small' or greedy == 'big':
-            decoder[word] = {}
-        elif len(word) < 1:
-            decoder[word] = []
-        if len(word) == 1 and word not in phoneme_dict and greedy == 'small' or greedy == 'big':
-            decoder[word] = {}
-        elif len(word) == 1 and word not in phoneme_dict:
-            decoder[word] = []
-
-        # get substrings except the first letter substrings from helper
-        substrings = get_substrings(word, phoneme_dict)
-
-        # get substrings containing the first letter
-        first_letter_strings = get_first_substring(word, phoneme_dict)
-
-        if first_letter_strings == [] and greedy == 'small':
-            decoder[word] = {}
-        elif first_letter_strings == [] and greedy == 'big':
-            decoder[word] = {}
-        elif first_letter_strings == []:
-            decoder[word] = []
-
-        # get possible IPA transcriptions of the word building upon each first letter substring for the word
-        for ss in first_letter_strings:
-            path = (phoneme_dict[ss])
-            master = get_transcriptions(ss, substrings, word, phoneme_dict, path, 1)
-            if greedy == 'small':
-                greedy_small(master, decoder, word)
-            elif greedy == 'big':
-                greedy_big(master, decoder, word)
-            else:
-                exhaustive(master, decoder, word)
+        if word in decoder:  # repeated words decode to the same transcriptions
+            continue
+
+        # get all the IPA transcriptions of the word by dynamic programming over its segmentation lattice
+        if profile is not None:
+            start = time.perf_counter()
+            stats = {}
+        else:
+            stats = None
+        lattice = build_lattice(word, trie)
+        master = get_transcriptions(lattice, phoneme_dict, greedy, stats, alphabet)
+        if greedy == 'small':
+            greedy_small(master, decoder, word)
+        elif greedy == 'big':
+            greedy_big(master, decoder, word)
+        else:
+            exhaustive(master, decoder, word)
+        if profile is not None:
+            stats["transcriptions"] = len(decoder[word]) if greedy == 'no' else \
+                sum(len(value) for value in decoder[word].values())
+            profile.add(word, time.perf_counter() - start, stats)
     return decoder
 
 
-def get_transcriptions(first_letter_ss: str, substrings: list[str], word: str, phoneme_dic: dict[str, list[str]],
-                       path: list[str], counter: int) -> dict[int: list[str]]:
+class PhonemeAlphabet:
     """
-    This function is a recursive helper function for <decode_words>. It returns a dictionary with the number of
-    recursions performed to get particular IPA transcriptions as keys and a list of IPA transcriptions as values. It
-    gets these IPA transcriptions based on the first letter substring being passed.
-    :param first_letter_ss: a particular substring of the word containing the first letter
-    :param substrings: a list of all substrings of the word containing IPA transcriptions except the first
-    letter substrings
-    :param word: word to be decoded
+    The phonemes of a phoneme dictionary, each interned as an integer code.
+
+    === Attributes ===
+    symbols: the IPA string of each phoneme code
+    codes: a dictionary with the IPA strings of the phonemes as keys and their codes as values
+    graphemes: a dictionary with the graphemes as keys and the codes of their phonemes as values, without the repeated
+    rows of the same GPC
+    """
+    symbols: list[str]
+    codes: dict[str, int]
+    graphemes: dict[str, list[int]]
+
+    def __init__(self, phoneme_dict: dict[str, list[str]]) -> None:
+        """
+        Intern the phonemes of <phoneme_dict>.
+        :param phoneme_dict: a dictionary containing grapheme-phoneme correspondences
+        """
+        self.symbols = []
+        self.codes = {}
+        self.graphemes = {grapheme: [self.intern(ipa) for ipa in dict.fromkeys(phonemes)]
+                          for grapheme, phonemes in phoneme_dict.items()}
+
+    def intern(self, ipa: str) -> int:
+        """
+        Return the code of a phoneme, giving it the next code if it has not been seen yet.
+        :param ipa: the IPA string of a phoneme
+        :return: the code of the phoneme
+        """
+        if ipa not in self.codes:
+            self.codes[ipa] = len(self.symbols)
+            self.symbols.append(ipa)
+        return self.codes[ipa]
+
+
+class TranscriptionLattice:
+    """
+    The transcriptions of a word in a compact, integer coded form. The transcriptions of the word from an offset onwards
+    are stored, for each number of GPCs, as a list of (phoneme code, end offset) blocks, where a block stands for every
+    transcription made of that phoneme followed by a transcription of the word from the end offset with one GPC fewer.
+    A transcription is therefore a path of blocks from offset 0 to the end of the word: a tuple of integers whose end
+    offsets are the boundaries of its segments. IPA strings are only made when the transcriptions are rendered.
+
+    === Attributes ===
+    length: the length of the word
+    alphabet: the alphabet that the phoneme codes come from
+    blocks: a list with one entry for each offset from 0 to <length>, where each entry is a dictionary with the number
+    of GPCs as keys and the list of (phoneme code, end offset) blocks of the transcriptions from that offset as values
+    last_use: a list with one entry for each offset, containing the smallest offset with a block that ends at it, or
+    -1 if there is none
+    """
+    length: int
+    alphabet: PhonemeAlphabet
+    blocks: list[dict[int, list[tuple[int, int]]]]
+    last_use: list[int]
+
+    def __init__(self, length: int, alphabet: PhonemeAlphabet) -> None:
+        """
+        Make an empty lattice for a word, which has no transcriptions until its blocks are added.
+        :param length: the length of the word
+        :param alphabet: the alphabet that the phoneme codes come from
+        """
+        self.length = length
+        self.alphabet = alphabet
+        self.blocks = [{} for _ in range(length + 1)]
+        self.last_use = [-1] * (length + 1)
+
+    def keys(self) -> list[int]:
+        """
+        Return the numbers of GPCs of the transcriptions of the word.
+        :return: the numbers of GPCs in increasing order, as <get_transcriptions> returns them. The list is empty if the
+        word cannot be decoded.
+        """
+        return sorted(self.blocks[0])
+
+    def paths(self, key: int) -> Iterator[tuple[tuple[int, int], ...]]:
+        """
+        Yield the integer coded transcriptions of the word with a number of GPCs. Two paths can render to the same IPA
+        string if the word can be split into graphemes in different ways.
+        :param key: a number of GPCs of <keys>
+        :return: a generator of tuples of (phoneme code, end offset) pairs, one for each GPC, in the order of the blocks
+        of the lattice, before the rendered transcriptions are sorted
+        """
+        stack = [(0, key, ())]
+        while stack:
+            offset, key, path = stack.pop()
+            if offset == self.length:
+                yield path
+                continue
+            for code, end in reversed(self.blocks[offset][key]):
+                stack.append((end, key - 1, path + ((code, end),)))
+
+    def render(self, path: tuple[tuple[int, int], ...]) -> str:
+        """
+        Return the IPA string of an integer coded transcription.
+        :param path: a path returned by <paths>
+        :return: the IPA transcription
+        """
+        return ''.join(self.alphabet.symbols[code] for code, _ in path)
+
+    def transcriptions(self) -> dict[int, list[str]]:
+        """
+        Render every transcription of the word. The transcriptions from each offset are rendered once, from the end of
+        the word backwards, and are forgotten as soon as the last offset with a block that ends at them is rendered.
+        :return: a dictionary with the number of GPCs as keys, in increasing order, and the sorted list of unique IPA
+        transcriptions as values, in the format of <get_transcriptions>
+        """
+        if self.blocks[0] == {}:
+            return {}
+        symbols = self.alphabet.symbols
+        rendered = {self.length: {0: ['']}}
+        for i in range(self.length - 1, -1, -1):
+            if self.blocks[i] != {}:
+                suffixes = {}
+                for key, blocks in self.blocks[i].items():
+                    transcriptions = {}  # a dictionary keeps the order without duplicates
+                    for code, end in blocks:
+                        ipa = symbols[code]
+                        for tail in rendered[end][key - 1]:
+                            transcriptions[ipa + tail] = None
+                    suffixes[key] = list(transcriptions)
+                rendered[i] = suffixes
+            for end in [end for end in rendered if self.last_use[end] == i]:
+                del rendered[end]
+        return {key: sorted(rendered[0][key]) for key in sorted(rendered[0])}
+
+    def contains(self, target_ipa: str) -> bool:
+        """
+        Check if a transcription is one of the transcriptions of the word, without rendering them.
+        :param target_ipa: an IPA transcription, e.g., from the 'Phonology' column of a curriculum
+        :return: True if <target_ipa> is one of the transcriptions of the word, False otherwise
+        """
+        stack = [(0, key, 0) for key in self.blocks[0]]
+        visited = set(stack)
+        while stack:
+            offset, key, position = stack.pop()
+            if offset == self.length:
+                if position == len(target_ipa):
+                    return True
+                continue
+            for code, end in self.blocks[offset][key]:
+                ipa = self.alphabet.symbols[code]
+                state = (end, key - 1, position + len(ipa))
+                if state not in visited and target_ipa.startswith(ipa, position):
+                    visited.add(state)
+                    stack.append(state)
+        return False
+
+
+def code_transcriptions(lattice: list[list[tuple[int, str]]], phoneme_dic: dict[str, list[str]], greedy: str,
+                        stats: dict[str, int] = None, alphabet: PhonemeAlphabet = None) -> TranscriptionLattice:
+    """
+    This function returns the integer coded transcriptions of a word. The transcriptions are computed from the end of
+    the word backwards: the blocks of an offset join each phoneme of each edge leaving that offset with the
+    transcriptions from the end offset of the edge, so every offset is only solved once and no transcription is built.
+    :param lattice: the segmentation lattice of the word built by <build_lattice>
     :param phoneme_dic: a dictionary containing grapheme-phoneme correspondences
-    :param path: the current path of the decoded word, i.e., the current IPA transcription of the word, which may be
-    partial or incomplete
-    :param counter: the current number of recursions done. The number of recursions start at 1 and not 0.
-    :return:  a dictionary with the number of recursions performed to get particular IPA transcriptions as keys and a
-    list of IPA transcriptions as values
-    """
-
-    # base case 1 (when the first letter substring is already equal to the word)
-    if first_letter_ss == word:
-        return {counter: path}
-
-    # base case 2 ( when the length of the first letter substring is more than or equal to the word but the strings do
-    # not match
-    elif len(first_letter_ss) >= len(word):
-        return {counter: []}
-
-    transcriptions = {}
-
-    # go through the substrings list to check which combinations can make up the word
-    for substring in substrings:
-        if first_letter_ss + substring in word:
-            partial_word = first_letter_ss + substring
-            counter_cpy = counter  # do this step to prevent aliasing
-            counter_cpy += 1  # increase the number of recursions done as this partial_word is in word
-            results_cpy = substrings.copy()  # do this step to prevent aliasing
-
-            # remove the substring from the list to avoid checking it again in further recursions
-            results_cpy.remove(substring)
-            path_cpy = []
-
-            # for all partial transcriptions currently in the path, add all possible combinations of the IPA
-            # transcriptions of the substring being checked
-            for i in range(len(path)):
-                for ipa in phoneme_dic[substring]:
-                    path_cpy.append(path[i] + ipa)
-
-            # recurse to get all possible IPA transcriptions building upon partial_word
-            transcription = get_transcriptions(partial_word, results_cpy, word, phoneme_dic, path_cpy, counter_cpy)
-            for key in transcription:
-                if key not in transcriptions:
-                    transcriptions[key] = transcription[key]
-                else:
-                    for value in transcription[key]:
-                        transcriptions[key].append(value)
-    return transcriptions
+    :param greedy: described in <decode_words>. If 'small' or 'big' is chosen, only the transcriptions with the maximum
+    or minimum number of GPCs are kept at every offset, as only those can be part of such a transcription of the word.
+    :param stats: if passed, this dictionary is filled with the work done for the word: "offsets", the number of
+    offsets of the lattice that were solved; "substrings", the number of graphemes matched at those offsets;
+    "combinations", the number of phoneme and suffix transcription pairs joined; and "peak", the largest number of
+    transcriptions from one offset, before the greedy modes discard any of them. The numbers of transcriptions count
+    every way of splitting the rest of the word into graphemes, so they can include repeated IPA strings.
+    :param alphabet: the alphabet of <phoneme_dic>. It is built from <phoneme_dic> if it is not passed.
+    :return: the transcriptions of the word. It has no transcriptions if the word cannot be decoded.
+    """
+    length = len(lattice)
+    if alphabet is None:
+        alphabet = PhonemeAlphabet(phoneme_dic)
+    coded = TranscriptionLattice(length, alphabet)
+    if stats is not None:
+        stats.update(offsets=0, substrings=0, combinations=0, peak=0)
+        sizes = [{} for _ in range(length + 1)]
+        sizes[length] = {0: 1}
+    if length == 0:  # an empty word has no grapheme-phoneme correspondences
+        return coded
+
+    # find the offsets that can be reached from the start of the word, as only these need to be solved
+    reachable = [False] * (length + 1)
+    reachable[0] = True
+    for i in range(length):
+        if reachable[i]:
+            for end, _ in lattice[i]:
+                reachable[end] = True
+    if not reachable[length]:
+        return coded
+
+    # blocks[i] holds the transcriptions of word[i:], keyed by the number of GPCs used
+    blocks = coded.blocks
+    blocks[length] = {0: []}
+    for i in range(length - 1, -1, -1):
+        if not reachable[i]:
+            continue
+        transcriptions = {}
+        for end, grapheme in lattice[i]:
+            coded.last_use[end] = i
+            for key in blocks[end]:
+                transcriptions.setdefault(key + 1, []).extend((code, end) for code in alphabet.graphemes[grapheme])
+        if stats is not None:
+            sizes[i] = {key: sum(sizes[end][key - 1] for _, end in value) for key, value in transcriptions.items()}
+            stats["offsets"] += 1
+            stats["substrings"] += len(lattice[i])
+            stats["combinations"] += sum(sizes[i].values())
+            stats["peak"] = max(stats["peak"], sum(sizes[i].values()))
+        if transcriptions != {} and greedy == 'small':
+            maxi = max(transcriptions)
+            transcriptions = {maxi: transcriptions[maxi]}
+        elif transcriptions != {} and greedy == 'big':
+            mini = min(transcriptions)
+            transcriptions = {mini: transcriptions[mini]}
+        blocks[i] = transcriptions
+    return coded
+
+
+def get_transcriptions(lattice: list[list[tuple[int, str]]], phoneme_dic: dict[str, list[str]], greedy: str,
+                       stats: dict[str, int] = None, alphabet: PhonemeAlphabet = None) -> dict[int, list[str]]:
+    """
+    This function is a helper function for <decode_words>. It returns a dictionary with the number of GPCs used to get
+    particular IPA transcriptions as keys and a list of IPA transcriptions as values. The transcriptions are coded by
+    <code_transcriptions> and only rendered into IPA strings at the end.
+    :param lattice: the segmentation lattice of the word built by <build_lattice>
+    :param phoneme_dic: a dictionary containing grapheme-phoneme correspondences
+    :param greedy: described in <code_transcriptions>
+    :param stats: described in <code_transcriptions>
+    :param alphabet: described in <code_transcriptions>
+    :return: a dictionary with the number of GPCs used to get particular IPA transcriptions as keys, in increasing
+    order, and the sorted list of IPA transcriptions as values. The dictionary is empty if the word cannot be decoded.
+    """
+    return code_transcriptions(lattice, phoneme_dic, greedy, stats, alphabet).transcriptions()
 
 
 def greedy_small(master: dict[int: list[str]], decoder: dict[str, dict[int, list[str]]], word: str) -> None:
@@ -239,21 +449,11 @@ def greedy_small(master: dict[int: list[str]], decoder: dict[str, dict[int, list
             if key > maxi:  # already a key with more recursions present
                 pass
             elif key == maxi:  # key with same number of recursions present, append to it
-                for value in master[maxi]:
-                    if value not in decoder[word][key]:  # to avoid duplicates
-                        decoder[word][key].append(value)
+                decoder[word][key] = sorted(set(decoder[word][key] + master[maxi]))  # to avoid duplicates
             else:  # we have the key with maximum recursions
-                decoder[word] = {}
-                decoder[word][maxi] = []
-                for value in master[maxi]:
-                    if value not in decoder[word][maxi]:  # to avoid duplicates
-                        decoder[word][maxi].append(value)
+                decoder[word] = {maxi: sorted(set(master[maxi]))}  # a set avoids duplicates
     else:  # word was not in decoder or decoder[word] was empty
-        decoder[word] = {}
-        decoder[word][maxi] = []
-        for value in master[maxi]:
-            if value not in decoder[word][maxi]:
-                decoder[word][maxi].append(value)
+        decoder[word] = {maxi: sorted(set(master[maxi]))}  # a set avoids duplicates
 
 
 def greedy_big(master: dict[int: list[str]], decoder: dict[str, dict[int, list[str]]], word: str) -> None:
@@ -284,21 +484,11 @@ def greedy_big(master: dict[int: list[str]], decoder: dict[str, dict[int, list[s
     if word in decoder and decoder[word] != {}:
         for key in decoder[word]:
             if key > maxi:  # we have the key with minimum recursions
-                decoder[word] = {}
-                decoder[word][maxi] = []
-                for value in master[maxi]:
-                    if value not in decoder[word][maxi]:  # to avoid duplicates
-                        decoder[word][maxi].append(value)
+                decoder[word] = {maxi: sorted(set(master[maxi]))}  # a set avoids duplicates
             elif key == maxi:  # key with same number of recursions present, append to it
-                for value in master[maxi]:
-                    if value not in decoder[word][key]:  # to avoid duplicates
-                        decoder[word][key].append(value)
+                decoder[word][key] = sorted(set(decoder[word][key] + master[maxi]))  # to avoid duplicates
     else:  # word was not in decoder or decoder[word] was empty
-        decoder[word] = {}
-        decoder[word][maxi] = []
-        for value in master[maxi]:
-            if value not in decoder[word][maxi]:  # to avoid duplicates
-                decoder[word][maxi].append(value)
+        decoder[word] = {maxi: sorted(set(master[maxi]))}  # a set avoids duplicates
 
 
 def exhaustive(master: dict[int: list[str]], decoder: dict[str, list[str]], word: str) -> None:
@@ -311,22 +501,203 @@ def exhaustive(master: dict[int: list[str]], decoder: dict[str, list[str]], word
     :param word: the word that was decoded
     :return: None
     """
-    # there were no IPA transcriptions for a particular instance of the first letter substring
-    if master == {0: []} and word not in decoder:
+    if word not in decoder:
         decoder[word] = []
 
-    # if the word was already in the decoder for some transcriptions but master was empty
-    elif master == {0: []}:
-        pass
-    else:  # master is not empty and word might or might not be present in the decoder
-        if word not in decoder:
-            decoder[word] = []
+    # add all transcriptions from master to the decoder dictionary, without duplicates and in sorted order. A set is
+    # used, as checking for duplicates in a list would be quadratic in their number
+    seen = set(decoder[word])
+    for item in master:
+        seen.update(master[item])
+    decoder[word] = sorted(seen)
+
+
+def viable_offsets(lattice: list[list[tuple[int, str]]]) -> list[bool]:
+    """
+    This function finds the offsets of a segmentation lattice from which the end of the word can be reached, i.e., the
+    offsets from which the rest of the word can be split into graphemes.
+    :param lattice: the segmentation lattice of the word built by <build_lattice>
+    :return: a list with one boolean for each offset from 0 to len(word), which is True if the end of the word can be
+    reached from that offset
+    """
+    viable = [False] * (len(lattice) + 1)
+    viable[len(lattice)] = True
+    for i in range(len(lattice) - 1, -1, -1):
+        viable[i] = any(viable[end] for end, _ in lattice[i])
+    return viable
+
 
-        # add all transcriptions from master to the decoder dictionary, without duplicates
-        for item in master:
-            for item2 in master[item]:
-                if item2 not in decoder[word]:
-                    decoder[word].append(item2)
+def is_decodable(word: str, phoneme_dict: dict[str, list[str]], trie: dict = None) -> bool:
+    """
+    This function checks if a word has at least one IPA transcription, i.e., if it can be split into graphemes that all
+    have phoneme correspondences in the dictionary.
+    :param word: the word to be decoded
+    :param phoneme_dict: a dictionary containing grapheme-phoneme correspondences
+    :param trie: a trie of the graphemes in <phoneme_dict> built by <build_grapheme_trie>. It is built from
+    <phoneme_dict> if it is not passed.
+    :return: True if the word can be decoded, False otherwise
+    """
+    word = word.lower().strip()
+    if trie is None:
+        trie = build_grapheme_trie(phoneme_dict)
+    return word != '' and viable_offsets(build_lattice(word, trie))[0]
+
+
+def iter_transcriptions(word: str, phoneme_dict: dict[str, list[str]], trie: dict = None) -> Iterator[str]:
+    """
+    This function lazily yields every unique IPA transcription of a word, i.e., the same transcriptions that the
+    exhaustive strategy returns. Transcriptions are produced one at a time by a depth first walk of the segmentation
+    lattice that only follows edges from which the end of the word can be reached, so the caller can stop as soon as it
+    has seen enough of them. They are yielded in the order of the lattice, not in the sorted order of <decode_words>.
+    :param word: the word to be decoded
+    :param phoneme_dict: a dictionary containing grapheme-phoneme correspondences
+    :param trie: a trie of the graphemes in <phoneme_dict> built by <build_grapheme_trie>. It is built from
+    <phoneme_dict> if it is not passed.
+    :return: a generator of the unique IPA transcriptions of the word
+    """
+    word = word.lower().strip()
+    if trie is None:
+        trie = build_grapheme_trie(phoneme_dict)
+    lattice = build_lattice(word, trie)
+    viable = viable_offsets(lattice)
+    if word == '' or not viable[0]:  # the word cannot be decoded
+        return
+    seen = set()
+    stack = [(0, '')]  # (offset in the word, transcription of the word up to that offset)
+    while stack:
+        offset, path = stack.pop()
+        if offset == len(lattice):
+            if path not in seen:
+                seen.add(path)
+                yield path
+            continue
+
+        # push the edges in reverse so that they are walked in the order of the lattice
+        for end, grapheme in reversed(lattice[offset]):
+            if viable[end]:
+                for ipa in reversed(phoneme_dict[grapheme]):
+                    stack.append((end, path + ipa))
+
+
+def can_decode_to(word: str, target_ipa: str, phoneme_dict: dict[str, list[str]], trie: dict = None) -> bool:
+    """
+    This function checks if a word can be decoded into a particular IPA transcription without enumerating the
+    transcriptions of the word. It walks the pairs of (offset in the word, offset in the target) that can be reached
+    by matching graphemes against the start of the rest of the target, and returns as soon as both ends are reached.
+    :param word: the word to be decoded
+    :param target_ipa: the IPA transcription that the word should be decoded into
+    :param phoneme_dict: a dictionary containing grapheme-phoneme correspondences
+    :param trie: a trie of the graphemes in <phoneme_dict> built by <build_grapheme_trie>. It is built from
+    <phoneme_dict> if it is not passed.
+    :return: True if <target_ipa> is one of the exhaustive IPA transcriptions of the word, False otherwise
+    """
+    word = word.lower().strip()
+    target_ipa = target_ipa.strip()
+    if word == '':
+        return False
+    if trie is None:
+        trie = build_grapheme_trie(phoneme_dict)
+    lattice = build_lattice(word, trie)
+    stack = [(0, 0)]
+    visited = {(0, 0)}
+    while stack:
+        offset, position = stack.pop()
+        if offset == len(lattice):
+            if position == len(target_ipa):
+                return True
+            continue
+        for end, grapheme in lattice[offset]:
+            for ipa in phoneme_dict[grapheme]:
+                state = (end, position + len(ipa))
+                if state not in visited and target_ipa.startswith(ipa, position):
+                    visited.add(state)
+                    stack.append(state)
+    return False
+
+
+def segment_counts(word: str, phoneme_dict: dict[str, list[str]], trie: dict = None) -> dict[int, int]:
+    """
+    This function counts the IPA transcriptions of a word for each number of GPCs the word can be split into, without
+    enumerating the transcriptions. The counts are computed by dynamic programming over the segmentation lattice: the
+    number of ways to decode the word from an offset onwards is the sum over the edges leaving that offset of the number
+    of distinct phonemes of the edge's grapheme times the number of ways to decode the word from the end of the edge.
+    Note that two different segmentations can produce the same IPA string, so the counts are the number of ways of
+    decoding the word and are an upper bound on the number of unique transcriptions.
+    :param word: the word to be decoded
+    :param phoneme_dict: a dictionary containing grapheme-phoneme correspondences
+    :param trie: a trie of the graphemes in <phoneme_dict> built by <build_grapheme_trie>. It is built from
+    <phoneme_dict> if it is not passed.
+    :return: a dictionary with the number of GPCs as keys and the number of ways of decoding the word with that many
+    GPCs as values. The dictionary is empty if the word cannot be decoded.
+    """
+    word = word.lower().strip()
+    if word == '':
+        return {}
+    if trie is None:
+        trie = build_grapheme_trie(phoneme_dict)
+    lattice = build_lattice(word, trie)
+
+    # counts[i] holds the number of ways of decoding word[i:], keyed by the number of GPCs used
+    counts = [{} for _ in range(len(lattice) + 1)]
+    counts[len(lattice)] = {0: 1}
+    for i in range(len(lattice) - 1, -1, -1):
+        for end, grapheme in lattice[i]:
+            choices = len(set(phoneme_dict[grapheme]))  # repeated rows of the same GPC do not add transcriptions
+            for key, count in counts[end].items():
+                counts[i][key + 1] = counts[i].get(key + 1, 0) + choices * count
+    return dict(sorted(counts[0].items()))
+
+
+def count_transcriptions(word: str, phoneme_dict: dict[str, list[str]], trie: dict = None) -> int:
+    """
+    This function returns the number of ways a word can be decoded into IPA with the exhaustive strategy, without
+    enumerating the transcriptions. See <segment_counts> for how the ways of decoding a word are counted.
+    :param word: the word to be decoded
+    :param phoneme_dict: a dictionary containing grapheme-phoneme correspondences
+    :param trie: a trie of the graphemes in <phoneme_dict> built by <build_grapheme_trie>. It is built from
+    <phoneme_dict> if it is not passed.
+    :return: the number of ways of decoding the word, which is 0 if the word cannot be decoded
+    """
+    return sum(segment_counts(word, phoneme_dict, trie).values())
+
+
+def segment_range(word: str, phoneme_dict: dict[str, list[str]], trie: dict = None) -> tuple[int, int]:
+    """
+    This function returns the minimum and maximum number of GPCs a word can be split into, i.e., the number of
+    recursions of the transcriptions that the 'big' and 'small' greedy modes keep.
+    :param word: the word to be decoded
+    :param phoneme_dict: a dictionary containing grapheme-phoneme correspondences
+    :param trie: a trie of the graphemes in <phoneme_dict> built by <build_grapheme_trie>. It is built from
+    <phoneme_dict> if it is not passed.
+    :return: a tuple containing the minimum and the maximum number of GPCs. Both values are 0 if the word cannot be
+    decoded, as every decodable word needs at least one GPC.
+    """
+    counts = segment_counts(word, phoneme_dict, trie)
+    if counts == {}:
+        return 0, 0
+    return min(counts), max(counts)
+
+
+def ambiguity_statistics(words: list[str], phoneme_dict: dict[str, list[str]]) -> dict[str, tuple[int, int, int]]:
+    """
+    This function returns the decoding ambiguity of every word in a list, e.g., a curriculum vocabulary or the words of
+    the 6k_AllReps_8Slot_NxF corpus, without enumerating any transcriptions.
+    :param words: List of words to be analysed
+    :param phoneme_dict: a dictionary containing grapheme-phoneme correspondences
+    :return: a dictionary containing the words as keys and tuples of (number of ways of decoding the word, minimum
+    number of GPCs, maximum number of GPCs) as values
+    """
+    trie = build_grapheme_trie(phoneme_dict)
+    statistics = {}
+    for word in words:
+        word = word.lower().strip()
+        if word not in statistics:
+            counts = segment_counts(word, phoneme_dict, trie)
+            if counts == {}:
+                statistics[word] = (0, 0, 0)
+            else:
+                statistics[word] = (sum(counts.values()), min(counts), max(counts))
+    return statistics
 
 
 def curricula_gpcs(file: str, curricula: int, alternative_implicit: bool) -> \
@@ -339,27 +710,122 @@ def curricula_gpcs(file: str, curricula: int, alternative_implicit: bool) -> \
     :param alternative_implicit: tells if we need to account for implicitly taught GPCs in each curricula
     :return: a dictionary with graphemes as keys and phoneme correspondences as a list as respective values
     """
-    file_handle = open(file)
-    read = file_handle.read()
-    lines = read.split('\n')  # split the file by the rows
-    rows = []
-    for comma in lines:  # split each individual line by commas
-        rows.append(comma.split(','))
-    gpcs = {}
-    for i in rows:
-        if alternative_implicit:  # if we want GPCs that have been implicitly taught in each curricula
-            if i[curricula].strip() == '1' or i[curricula].strip() == '2':
-                if i[0] not in gpcs:
-                    gpcs[i[0]] = [i[1]]
-                else:
-                    gpcs[i[0]].append(i[1])
-        else:  # if we do not want GPCs that have been implicitly taught in each curricula
-            if i[curricula].strip() == '1':
-                if i[0] not in gpcs:
-                    gpcs[i[0]] = [i[1]]
+    return GPCRuleSet(file).curriculum(curricula, alternative_implicit)
+
+
+class GPCRuleSet:
+    """
+    A set of GPCs read from a CSV file in the format described at the top of this module. The file is read in a single
+    pass, and the curriculum columns (JP, LS and any columns after them) are stored as bitmasks over the rows of the
+    file, so that the GPCs of a curriculum, with or without the implicitly taught GPCs, are cheap views of the rows
+    rather than a new read of the file. The rule set also owns the grapheme tries used to decode words with each view.
+
+    === Attributes ===
+    rows: the (grapheme, phoneme) pair of each row of the file, in the order of the file
+    taught: a dictionary with the column position of each curriculum as keys and a bitmask of the rows taught in that
+    curriculum (marked 1) as values. Bit i of a mask stands for rows[i].
+    implicit: a dictionary with the column position of each curriculum as keys and a bitmask of the rows implicitly
+    taught in that curriculum (marked 2) as values
+    """
+    rows: list[tuple[str, str]]
+    taught: dict[int, int]
+    implicit: dict[int, int]
+    _tries: dict[int, dict]
+
+    def __init__(self, file: str) -> None:
+        """
+        Read the GPCs and the curriculum columns of <file>.
+        :param file: A CSV file that contains information about graphemes and their corresponding phonemes
+        """
+        self.rows = []
+        self.taught = {}
+        self.implicit = {}
+        self._tries = {}
+        with open(file) as f:
+            f.readline()  # skip the first line, as it only contains headers
+            for line in f:
+                if line.strip() == '':
+                    continue
+                values = line.rstrip('\n').split(',')
+                bit = 1 << len(self.rows)
+                self.rows.append((values[0], values[1]))
+                for column in range(JP, len(values)):
+                    if values[column].strip() == '1':
+                        self.taught[column] = self.taught.get(column, 0) | bit
+                    elif values[column].strip() == '2':
+                        self.implicit[column] = self.implicit.get(column, 0) | bit
+
+    def mask(self, curricula: int = None, alternative_implicit: bool = False) -> int:
+        """
+        Return the bitmask of the rows that belong to a view of the rule set.
+        :param curricula: the column position of a curriculum, e.g., JP or LS. If it is not passed, all rows are used.
+        :param alternative_implicit: tells if we need to account for implicitly taught GPCs in the curriculum
+        :return: a bitmask over the rows of the rule set
+        """
+        if curricula is None:
+            return (1 << len(self.rows)) - 1
+        if alternative_implicit:
+            return self.taught.get(curricula, 0) | self.implicit.get(curricula, 0)
+        return self.taught.get(curricula, 0)
+
+    def view(self, mask: int) -> dict[str, list[str]]:
+        """
+        Return the GPCs of the rows in a bitmask.
+        :param mask: a bitmask over the rows of the rule set
+        :return: a dictionary with graphemes as keys and phoneme correspondences as a list as respective values
+        """
+        gpcs = {}
+        i = 0
+        while mask:
+            if mask & 1:
+                grapheme, phoneme = self.rows[i]
+                if grapheme not in gpcs:
+                    gpcs[grapheme] = [phoneme]
                 else:
-                    gpcs[i[0]].append(i[1])
-    return gpcs
+                    gpcs[grapheme].append(phoneme)
+            mask >>= 1
+            i += 1
+        return gpcs
+
+    def all_gpcs(self) -> dict[str, list[str]]:
+        """
+        Return all the GPCs of the rule set, in the same format as <read_orthography>.
+        :return: a dictionary with graphemes as keys and phoneme correspondences as a list as respective values
+        """
+        return self.view(self.mask())
+
+    def curriculum(self, curricula: int, alternative_implicit: bool) -> dict[str, list[str]]:
+        """
+        Return the GPCs taught in a curriculum, in the same format as <curricula_gpcs>.
+        :param curricula: the column position of a curriculum, e.g., JP or LS
+        :param alternative_implicit: tells if we need to account for implicitly taught GPCs in the curriculum
+        :return: a dictionary with graphemes as keys and phoneme correspondences as a list as respective values
+        """
+        return self.view(self.mask(curricula, alternative_implicit))
+
+    def trie(self, mask: int) -> dict:
+        """
+        Return the grapheme trie of the rows in a bitmask. The trie of each view is only built once.
+        :param mask: a bitmask over the rows of the rule set
+        :return: the root node of the trie, as built by <build_grapheme_trie>
+        """
+        if mask not in self._tries:
+            self._tries[mask] = build_grapheme_trie(self.view(mask))
+        return self._tries[mask]
+
+    def decode(self, words: list[str], greedy: str, curricula: int = None, alternative_implicit: bool = False,
+               profile=None) -> Union[dict[str, list[str]], dict[str, dict[int, list[str]]]]:
+        """
+        Decode a list of words with a view of the rule set, reusing the trie of the view.
+        :param words: List of words to be decoded into IPA
+        :param greedy: described in <decode_words>
+        :param curricula: the column position of a curriculum, e.g., JP or LS. If it is not passed, all GPCs are used.
+        :param alternative_implicit: tells if we need to account for implicitly taught GPCs in the curriculum
+        :param profile: described in <decode_words>
+        :return: the dictionary returned by <decode_words>
+        """
+        mask = self.mask(curricula, alternative_implicit)
+        return decode_words(words, self.view(mask), greedy, self.trie(mask), profile)
 
 
 if __name__ == '__main__':
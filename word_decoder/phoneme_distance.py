@@ -0,0 +1,275 @@
+"""
+This module measures how close a transcription produced by decoder.py is to the correct transcription of a word, with
+an edit distance between the phonemes of the two transcriptions. Deleting or inserting a phoneme costs 1, and
+substituting one phoneme for another costs less the more confusable the two phonemes are, according to the confusion
+matrices of the phoneme_confusability directory.
+
+The confusability values are read from the binary results stored by confusion_matrix.py (run it, or call
+<analyse_files> with binary=True, to produce them). The decoder writes its transcriptions in IPA, e.g., /ʃ/, /dʒ/ and
+/aɪ/, while the datasets use their own symbols for the same phonemes, e.g., š, ǰ and ā y in CH68, or S, J and A in
+pho_train_pat_gen. A transcription is therefore split into the phonemes of the decoder, and each phoneme is measured as
+the symbols of the dataset given by <SYMBOLS> and <SPLITS>. Phonemes that cannot be given symbols of the dataset are
+reported with a warning, and can only be substituted by themselves for free, and cost 1 to substitute otherwise.
+
+Many pairs of transcriptions are measured at once: the dynamic programming table of every pair is filled one row at a
+time, with each row computed for all the pairs together.
+"""
+
+import json
+import os
+import unicodedata
+import warnings
+
+import numpy as np
+from numpy import ndarray
+
+# the Results directory of confusion_matrix.py
+CONFUSABILITY_RESULTS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                     "phoneme_confusability", "Results")
+
+# the symbols a phoneme of the decoder can have in the datasets, in order of preference, e.g., /i/ is the tense ɪ̄ of
+# CH68, whose i is the lax vowel. The first one that the dataset has is used. Any other phoneme is only looked up as it
+# is
+SYMBOLS = {"ʃ": ["ʃ", "š", "S"], "ʒ": ["ʒ", "ž", "Z"], "tʃ": ["tʃ", "č", "C"], "dʒ": ["dʒ", "ǰ", "J"],
+           "θ": ["θ", "T"], "ð": ["ð", "D"], "ŋ": ["ŋ", "G"], "ɹ": ["ɹ", "r"], "j": ["j", "y", "i"],
+           "w": ["w", "u"], "ʍ": ["ʍ", "w", "u"], "ɾ": ["ɾ", "d"], "ɾ̃": ["ɾ̃", "n"], "l̩": ["l̩", "l"],
+           "m̩": ["m̩", "m"], "n̩": ["n̩", "n"], "kw": ["kʷ"],
+           "i": ["ɪ̄", "ī", "i"], "ɪ": ["ɪ", "I", "i"], "ɨ": ["ɨ", "ɪ", "I", "i"], "eɪ": ["eɪ", "ē", "e"],
+           "ɛ": ["ɛ", "E", "e"], "æ": ["æ", "@"], "ɑ": ["ɑ", "ā", "a"], "oʊ": ["oʊ", "ō", "o"], "u": ["ū", "u"],
+           "ʊ": ["ʊ", "U", "u"], "ʌ": ["ʌ", "^"], "ə": ["ə", "ʌ", "^"], "aɪ": ["aɪ", "A"], "aʊ": ["aʊ", "W"],
+           "ɔɪ": ["ɔɪ", "O"]}
+
+# the phonemes of the decoder that are measured as a sequence of other phonemes of the decoder when the dataset has no
+# symbol for them in <SYMBOLS>, e.g., diphthongs, r-coloured vowels and clusters
+SPLITS = {"tʃ": ["t", "ʃ"], "dʒ": ["d", "ʒ"], "ks": ["k", "s"], "kw": ["k", "w"], "ju": ["j", "u"], "aɪ": ["ɑ", "j"],
+          "aʊ": ["ɑ", "w"], "ɔɪ": ["ɔ", "j"], "iɹ": ["i", "ɹ"], "ɑɹ": ["ɑ", "ɹ"], "ɔɹ": ["ɔ", "ɹ"], "ɛɹ": ["ɛ", "ɹ"],
+          "ɚ": ["ə", "ɹ"], "ɝ": ["ə", "ɹ"]}
+
+# changes to <SYMBOLS> for datasets where a symbol stands for another phoneme, e.g., y is a rounded front vowel in FF
+DATASET_SYMBOLS = {"FF.txt": {"j": ["j", "i"]}, "json.txt": {"j": ["j", "i"]}}
+
+# the phonemes of the decoder with more than one character, which are kept whole when a transcription is split
+INVENTORY = sorted({unicodedata.normalize("NFD", phoneme) for phoneme in list(SYMBOLS) + list(SPLITS)
+                    if len(unicodedata.normalize("NFD", phoneme)) > 1}, key=len, reverse=True)
+
+
+def segments(ipa: str) -> list[str]:
+    """
+    This function splits an IPA transcription into the phonemes of the decoder. The phonemes of <INVENTORY> are taken
+    whole, longest first, e.g., /tʃ/ and /aɪ/, and any other symbol is kept with the combining diacritics that follow
+    it.
+    :param ipa: an IPA transcription
+    :return: the list of phonemes of the transcription
+    """
+    ipa = unicodedata.normalize("NFD", ipa)
+    phonemes = []
+    i = 0
+    while i < len(ipa):
+        phoneme = next((phoneme for phoneme in INVENTORY if ipa.startswith(phoneme, i)), ipa[i])
+        i += len(phoneme)
+        while i < len(ipa) and unicodedata.combining(ipa[i]):
+            phoneme += ipa[i]
+            i += 1
+        phonemes.append(phoneme)
+    return phonemes
+
+
+class WeightedEditDistance:
+    """
+    An edit distance between IPA transcriptions whose substitution costs come from the confusability of the phonemes.
+
+    === Attributes ===
+    alphabet: a dictionary with the symbols seen so far as keys and their position in the cost matrix as values. The
+    symbols of the dataset come first, in the order of the cost matrix.
+    costs: a square matrix, where the value at [i, j] is the cost of substituting symbol j for symbol i
+    dataset: the symbols of the dataset
+    symbols: a dictionary with the symbols of the dataset that each phoneme of the decoder is measured as, in the format
+    of <SYMBOLS>
+    encoded: a dictionary with the phonemes of the decoder seen so far as keys and the positions of their symbols in
+    the cost matrix as values
+    unmapped: the phonemes seen so far that could not be given symbols of the dataset
+    """
+    alphabet: dict[str, int]
+    costs: ndarray
+    dataset: set[str]
+    symbols: dict[str, list[str]]
+    encoded: dict[str, list[int]]
+    unmapped: set[str]
+
+    def __init__(self, phonemes: list[str], scores: ndarray, symbols: dict[str, list[str]] = None) -> None:
+        """
+        Make the substitution costs from the normalised confusability values of a dataset. The cost of substituting
+        two different phonemes is 1 minus their normalised value, limited to between 0 and 1, so a substitution never
+        costs more than a deletion.
+        :param phonemes: the phonemes of the dataset, in the order of the rows and columns of <scores>
+        :param scores: a square matrix, where the value at [i, j] is the normalised value of phonemes i and j
+        :param symbols: the symbols that the phonemes of the decoder have in the dataset. <SYMBOLS> is used if not
+        passed.
+        """
+        self.alphabet = {unicodedata.normalize("NFD", phoneme): i for i, phoneme in enumerate(phonemes)}
+        self.costs = np.clip(1 - np.nan_to_num(np.asarray(scores, dtype=float), nan=0.0), 0, 1)
+        np.fill_diagonal(self.costs, 0)
+        self.dataset = set(self.alphabet)
+        self.symbols = SYMBOLS if symbols is None else symbols
+        self.encoded = {}
+        self.unmapped = set()
+
+    def _map(self, phoneme: str) -> list[str]:
+        """
+        Return the symbols of the dataset that a phoneme of the decoder is measured as: the first of its symbols in
+        <symbols> that the dataset has, or else the symbols of the phonemes it is split into by <SPLITS>.
+        :param phoneme: a phoneme of the decoder
+        :return: the symbols of the phoneme, or an empty list if the dataset has no symbols for it
+        """
+        for symbol in self.symbols.get(phoneme, [phoneme]):
+            symbol = unicodedata.normalize("NFD", symbol)
+            if symbol in self.dataset:
+                return [symbol]
+        parts = [self._map(unicodedata.normalize("NFD", part)) for part in SPLITS.get(phoneme, [])]
+        if parts and all(parts):
+            return [symbol for part in parts for symbol in part]
+        return []
+
+    def encode(self, ipa: str) -> list[int]:
+        """
+        Return the positions of the symbols of a transcription in the cost matrix. A phoneme that cannot be given
+        symbols of the dataset is added to the alphabet as it is, and a warning is given the first time it is seen.
+        :param ipa: an IPA transcription
+        :return: the list of positions of the symbols of the phonemes of <ipa>
+        """
+        positions = []
+        for phoneme in segments(ipa):
+            if phoneme not in self.encoded:
+                mapped = self._map(phoneme)
+                if mapped == []:
+                    self.unmapped.add(phoneme)
+                    warnings.warn("the phoneme /" + phoneme + "/ has no symbol in the dataset, so substituting it "
+                                  "costs 1", stacklevel=2)
+                    mapped = [phoneme]
+                self.encoded[phoneme] = [self.alphabet.setdefault(symbol, len(self.alphabet)) for symbol in mapped]
+            positions.extend(self.encoded[phoneme])
+        return positions
+
+    def _cost_matrix(self) -> ndarray:
+        """
+        Return the cost matrix extended to every phoneme of the alphabet, where the phonemes that are not in the
+        dataset cost 1 to substitute for any other phoneme.
+        :return: the extended cost matrix
+        """
+        extra = len(self.alphabet) - len(self.costs)
+        if extra > 0:
+            self.costs = np.pad(self.costs, (0, extra), constant_values=1)
+            np.fill_diagonal(self.costs, 0)
+        return self.costs
+
+    def distances(self, pairs: list[tuple[str, str]]) -> ndarray:
+        """
+        Return the weighted edit distance of every pair of transcriptions.
+        :param pairs: a list of (transcription, transcription) tuples
+        :return: an array with the distance of each pair
+        """
+        first = [self.encode(pair[0]) for pair in pairs]
+        second = [self.encode(pair[1]) for pair in pairs]
+        costs = self._cost_matrix()
+        length_1 = np.array([len(phonemes) for phonemes in first], dtype=int)
+        length_2 = np.array([len(phonemes) for phonemes in second], dtype=int)
+        m, n = max(length_1, default=0), max(length_2, default=0)
+
+        # pad the transcriptions to the same length; the padding is never read for the distance of a pair
+        codes_1 = np.zeros((len(pairs), m), dtype=int)
+        codes_2 = np.zeros((len(pairs), n), dtype=int)
+        for k in range(len(pairs)):
+            codes_1[k, :length_1[k]] = first[k]
+            codes_2[k, :length_2[k]] = second[k]
+
+        offsets = np.arange(n + 1)
+        row = np.tile(offsets.astype(float), (len(pairs), 1))  # the first row of the table: insert every phoneme
+        result = row[np.arange(len(pairs)), length_2].copy()
+        for i in range(1, m + 1):
+            # cheapest way to reach each cell from the previous row, by deleting or substituting a phoneme
+            reach = np.empty((len(pairs), n + 1))
+            reach[:, 0] = i
+            reach[:, 1:] = np.minimum(row[:, 1:] + 1, row[:, :-1] + costs[codes_1[:, i - 1][:, None], codes_2])
+
+            # then by inserting phonemes along the row, which costs 1 each
+            row = np.minimum.accumulate(reach - offsets, axis=1) + offsets
+            done = length_1 == i
+            result[done] = row[done, length_2[done]]
+        return result
+
+    def closest_misses(self, targets: list[str], candidates: list[list[str]]) -> list[float]:
+        """
+        Return, for each target transcription, the distance to the closest of its candidate transcriptions.
+        :param targets: a list of transcriptions
+        :param candidates: for each target, a list of transcriptions to compare it to
+        :return: the smallest distance for each target, or NaN if it has no candidates
+        """
+        pairs = [(target, candidate) for target, options in zip(targets, candidates) for candidate in options]
+        distances = self.distances(pairs)
+        closest = []
+        start = 0
+        for options in candidates:
+            closest.append(float(distances[start:start + len(options)].min()) if options else float("nan"))
+            start += len(options)
+        return closest
+
+    def lattice_distance(self, target: str, lattice: list[list[tuple[int, str]]],
+                         phoneme_dict: dict[str, list[str]]) -> float:
+        """
+        Return the distance from a target transcription to the closest transcription of a word, without enumerating
+        the transcriptions, whose number grows exponentially with the length of the word. The column of the dynamic
+        programming table of every offset of the word is the cheapest column of any transcription of the word up to
+        that offset, as every path from the offset onwards adds the same costs to it. Each phoneme of a GPC is measured
+        on its own, e.g., /k/ followed by /w/ is not read as /kw/.
+        :param target: a transcription, e.g., the coded phonology of the word
+        :param lattice: the segmentation lattice of the word built by <build_lattice> in decoder.py
+        :param phoneme_dict: a dictionary containing grapheme-phoneme correspondences
+        :return: the smallest distance from <target> to a transcription of the word, or NaN if the word cannot be
+        decoded
+        """
+        codes = np.array(self.encode(target), dtype=int)
+        phonemes = {}  # the encoded symbols of each phoneme of the graphemes
+        for edges in lattice:
+            for _, grapheme in edges:
+                for ipa in phoneme_dict[grapheme]:
+                    if ipa not in phonemes:
+                        phonemes[ipa] = self.encode(ipa)
+        costs = self._cost_matrix()
+        offsets = np.arange(len(codes) + 1)
+        columns = [None] * (len(lattice) + 1)
+        columns[0] = offsets.astype(float)  # the first column of the table: delete every phoneme of the target
+        for i, edges in enumerate(lattice):
+            if columns[i] is None:  # no transcription reaches the offset
+                continue
+            for end, grapheme in edges:
+                for ipa in phoneme_dict[grapheme]:
+                    column = columns[i]
+                    for symbol in phonemes[ipa]:
+                        # cheapest way to reach each cell from the previous column, by inserting or substituting a
+                        # symbol, then by deleting phonemes of the target along the column
+                        reach = np.empty(len(codes) + 1)
+                        reach[0] = column[0] + 1
+                        reach[1:] = np.minimum(column[1:] + 1, column[:-1] + costs[codes, symbol])
+                        column = np.minimum.accumulate(reach - offsets) + offsets
+                    columns[end] = column if columns[end] is None else np.minimum(columns[end], column)
+        if len(lattice) == 0 or columns[len(lattice)] is None:
+            return float("nan")
+        return float(columns[len(lattice)][len(codes)])
+
+
+def load_distance(fil: str = "CH68.txt", overlap: bool = True, results: str = CONFUSABILITY_RESULTS) -> \
+        WeightedEditDistance:
+    """
+    This function makes the weighted edit distance of a confusability dataset from the binary results of
+    confusion_matrix.py.
+    :param fil: the .txt dataset of the phoneme_confusability directory to take the substitution costs from
+    :param overlap: if true, use the normalised overlap values, else the correlation values
+    :param results: the Results directory of confusion_matrix.py
+    :return: the weighted edit distance, with the symbols of <SYMBOLS> changed by <DATASET_SYMBOLS> for the dataset
+    """
+    file_name = fil[:fil.index(".")]
+    method = "_overlap" if overlap else "_correlation"
+    with open(os.path.join(results, fil, file_name + "_phonemes.json"), encoding="utf-8") as f:
+        phonemes = json.load(f)
+    return WeightedEditDistance(phonemes, np.load(os.path.join(results, fil, file_name + method + ".npy"),
+                                                  mmap_mode="r"), dict(SYMBOLS, **DATASET_SYMBOLS.get(fil, {})))
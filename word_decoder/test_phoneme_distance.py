@@ -0,0 +1,63 @@
+"""
+Tests for phoneme_distance.py, with substitution costs computed from the feature datasets of the
+phoneme_confusability directory.
+"""
+import os
+import sys
+import unicodedata
+
+import pytest
+
+import decoder
+import phoneme_distance
+
+CONFUSABILITY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "phoneme_confusability")
+sys.path.insert(0, CONFUSABILITY)
+
+import confusion_matrix  # noqa: E402
+
+
+def dataset_distance(fil: str) -> phoneme_distance.WeightedEditDistance:
+    """
+    Return the weighted edit distance of a dataset with its normalised overlap values, as <load_distance> makes it.
+    """
+    table = confusion_matrix.load_feature_table(os.path.join(CONFUSABILITY, fil))
+    return phoneme_distance.WeightedEditDistance(table.phonemes, table.pair_scores(True),
+                                                 dict(phoneme_distance.SYMBOLS,
+                                                      **phoneme_distance.DATASET_SYMBOLS.get(fil, {})))
+
+
+def test_segments_keeps_multi_character_phonemes() -> None:
+    assert phoneme_distance.segments("tʃaɪld") == ["tʃ", "aɪ", "l", "d"]
+    assert phoneme_distance.segments("bɑɹn̩") == ["b", "ɑɹ", "n̩"]
+
+
+def test_confusable_pair_costs_less_than_one() -> None:
+    distance = dataset_distance("CH68.txt")
+    close, far, same = distance.distances([("ʃɪp", "ʒɪp"), ("ʃɪp", "mɪp"), ("ʃɪp", "ʃɪp")])
+    assert 0 < close < far < 1
+    assert same == 0
+    assert distance.unmapped == set()
+
+
+def test_diphthong_is_measured_as_its_symbols() -> None:
+    distance = dataset_distance("CH68.txt")
+    assert distance.encode("aɪ") == [distance.alphabet[unicodedata.normalize("NFD", "ā")], distance.alphabet["y"]]
+
+
+def test_unmapped_phoneme_warns() -> None:
+    distance = dataset_distance("FF.txt")  # FF has no symbol for /ɑ/
+    with pytest.warns(UserWarning, match="ɑ"):
+        assert distance.distances([("bɑt", "bɑt")])[0] == 0
+    assert distance.unmapped == {"ɑ"}
+
+
+def test_lattice_distance_matches_closest_transcription() -> None:
+    distance = dataset_distance("CH68.txt")
+    phoneme_dict = decoder.read_orthography(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                         "phoneme dictionary.xlsx - Sheet1.csv"))
+    trie = decoder.build_grapheme_trie(phoneme_dict)
+    for word, target in [("tennis", "tɛnəs"), ("ship", "ʒɪb"), ("chair", "ʃɛɹ")]:
+        closest = distance.closest_misses([target], [list(decoder.iter_transcriptions(word, phoneme_dict, trie))])[0]
+        assert distance.lattice_distance(target, decoder.build_lattice(word, trie), phoneme_dict) == \
+            pytest.approx(closest)